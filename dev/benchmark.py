@@ -0,0 +1,292 @@
+#! /usr/bin/env python3
+
+"""
+Measure the runtime of Vulture's analysis on generated code.
+
+Run all benchmarks with "dev/benchmark.py" or select some by name, e.g.,
+"dev/benchmark.py traversal". To compare two revisions, run the script
+once on each of them.
+"""
+
+import argparse
+import pathlib
+import sys
+import tempfile
+import time
+import tracemalloc
+
+REPO = pathlib.Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(REPO))
+
+from vulture import core  # noqa: E402
+from vulture.server import AnalysisServer  # noqa: E402
+from vulture.watch import Watcher  # noqa: E402
+
+
+def measure(func, repeat=5):
+    """Return the best runtime of func in seconds."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def report(name, seconds):
+    print(f"{name:<50} {seconds * 1000:10.1f} ms")
+
+
+def scan(code, filename="", **kwargs):
+    vulture = core.Vulture(**kwargs)
+    vulture.scan(code, filename=filename)
+    return vulture
+
+
+def generate_large_module(classes=200, methods=10):
+    parts = ["import os\nimport sys\n\n"]
+    for i in range(classes):
+        parts.append(f"class Class{i}(object):\n")
+        parts.extend(
+            f"    def method{j}(self, arg{j}, *args, **kwargs):\n"
+            f"        value = self.attr{j} + arg{j}\n"
+            f"        if value > {j} and not kwargs:\n"
+            f"            return [x for x in args if x != value]\n"
+            f"        return {{'key': value, 'other': (1, 2, 3)}}\n\n"
+            for j in range(methods)
+        )
+    return "".join(parts)
+
+
+def generate_elif_chain(length=1500):
+    return "if x == 0:\n    pass\n" + "".join(
+        f"elif x == {i}:\n    pass\n" for i in range(1, length)
+    )
+
+
+def bench_traversal():
+    large_module = generate_large_module()
+    report("traversal: large module", measure(lambda: scan(large_module)))
+    elif_chain = generate_elif_chain()
+    report("traversal: long elif chain", measure(lambda: scan(elif_chain)))
+
+
+def generate_test_module(classes=20, methods=100):
+    parts = ["import pytest\n\n"]
+    for i in range(classes):
+        parts.append(f"class TestClass{i}:\n")
+        parts.append("    def setup_method(self):\n        self.x = 1\n\n")
+        parts.extend(
+            f"    def test_{j}(self, fixture_{j}):\n"
+            f"        assert self.x == fixture_{j}\n\n"
+            for j in range(methods)
+        )
+    return "".join(parts)
+
+
+def bench_test_files():
+    test_module = generate_test_module()
+    filename = REPO / "tests" / "test_generated.py"
+    report(
+        "test files: 2000 test methods",
+        measure(lambda: scan(test_module, filename=filename)),
+    )
+
+
+def generate_nested_loops(functions=50, depth=90):
+    """Deeply nested infinite loops are the worst case for break analysis."""
+    parts = []
+    for i in range(functions):
+        parts.append(f"def loop{i}():\n")
+        for level in range(1, depth + 1):
+            indent = "    " * level
+            parts.append(
+                f"{indent}while True:\n"
+                f"{indent}    if x{level}:\n"
+                f"{indent}        continue\n"
+            )
+        parts.append("    " * (depth + 1) + "break\n")
+    return "".join(parts)
+
+
+def bench_reachability():
+    nested_loops = generate_nested_loops()
+    report(
+        "reachability: nested while True loops",
+        measure(lambda: scan(nested_loops)),
+    )
+
+
+def bench_only_types():
+    large_module = generate_large_module()
+    for only_types in [
+        None,
+        ["import"],
+        ["unreachable_code"],
+        ["function", "method"],
+    ]:
+        mode = ",".join(only_types or ["all"])
+        report(
+            f"only types: {mode}",
+            measure(
+                lambda only_types=only_types: scan(
+                    large_module, only_types=only_types
+                )
+            ),
+        )
+
+
+def generate_definitions_module(functions=5000):
+    """Most definitions are used, as in typical code bases."""
+    parts = []
+    for i in range(functions):
+        parts.append(
+            f"def func{i}(arg{i}):\n"
+            f"    var{i} = arg{i}.attr{i} = {i}\n"
+            f"    return var{i}\n"
+        )
+        if i % 10:
+            parts.append(f"func{i}(attr{i})\n")
+    return "".join(parts)
+
+
+def bench_min_confidence(modules=10):
+    large_module = generate_definitions_module()
+    for min_confidence in [0, 100]:
+        report(
+            f"min confidence {min_confidence}: {modules} modules",
+            measure(
+                lambda min_confidence=min_confidence: [
+                    scan(large_module, min_confidence=min_confidence)
+                    for _ in range(modules)
+                ],
+                repeat=3,
+            ),
+        )
+        tracemalloc.start()
+        vulture = core.Vulture(min_confidence=min_confidence)
+        for i in range(modules):
+            vulture.scan(large_module, filename=f"module{i}.py")
+        retained, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(
+            f"{f'min confidence {min_confidence}: retained':<50}"
+            f" {retained / 2**20:10.1f} MiB"
+        )
+
+
+def bench_memory(modules=10):
+    large_module = generate_definitions_module()
+    tracemalloc.start()
+    vulture = core.Vulture()
+    for i in range(modules):
+        vulture.scan(large_module, filename=f"module{i}.py")
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+    for _ in vulture.iter_unused():
+        pass
+    _, iter_peak = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+    unused_code = vulture.get_unused_code()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    definitions = sum(
+        len(collection)
+        for collection in [
+            vulture.defined_attrs,
+            vulture.defined_classes,
+            vulture.defined_funcs,
+            vulture.defined_imports,
+            vulture.defined_methods,
+            vulture.defined_props,
+            vulture.defined_vars,
+        ]
+    )
+    print(f"memory: {definitions} definitions, {len(unused_code)} unused")
+    for name, size in [
+        ("retained after scanning", retained),
+        ("peak for iter_unused()", iter_peak),
+        ("peak for get_unused_code()", peak),
+    ]:
+        print(f"{'memory: ' + name:<50} {size / 2**20:10.1f} MiB")
+
+
+def generate_project_module(i):
+    previous = max(i - 1, 0)
+    return (
+        f"import os\n"
+        f"from module{previous} import func{previous}\n\n"
+        f"class Class{i}:\n"
+        f"    def method{i}(self, arg):\n"
+        f"        return func{previous}(arg) + self.attr{i}\n\n"
+        f"def func{i}(arg):\n"
+        f"    return os.path.join(arg, 'name{i}')\n"
+    )
+
+
+def bench_server(modules=20000):
+    server = AnalysisServer({})
+    for i in range(modules):
+        server.update(f"module{i}.py", generate_project_module(i))
+    server.report()
+    changed_module = generate_project_module(modules // 2) + "unused = 1\n"
+    report(
+        f"server: update 1 of {modules} modules",
+        measure(lambda: server.update("module0.py", changed_module)),
+    )
+    report(
+        f"server: update 1 of {modules} modules and report",
+        measure(
+            lambda: [
+                server.update("module0.py", changed_module),
+                server.report(),
+            ],
+            repeat=3,
+        ),
+    )
+
+
+def bench_watch(modules=20000, per_directory=100):
+    with tempfile.TemporaryDirectory() as directory:
+        root = pathlib.Path(directory)
+        for i in range(modules):
+            package = root / f"package{i // per_directory}"
+            package.mkdir(exist_ok=True)
+            (package / f"module{i}.py").write_text(generate_project_module(i))
+        watcher = Watcher(core.Vulture(), [root])
+        watcher.scan()
+        report(
+            f"watch: poll {modules} unchanged modules",
+            measure(watcher.poll, repeat=3),
+        )
+
+
+BENCHMARKS = {
+    "traversal": bench_traversal,
+    "test-files": bench_test_files,
+    "reachability": bench_reachability,
+    "only-types": bench_only_types,
+    "memory": bench_memory,
+    "min-confidence": bench_min_confidence,
+    "server": bench_server,
+    "watch": bench_watch,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "benchmarks",
+        nargs="*",
+        metavar="BENCHMARK",
+        help=f"Benchmarks to run (default: all). Choices: {list(BENCHMARKS)}",
+    )
+    args = parser.parse_args()
+    for name in args.benchmarks or BENCHMARKS:
+        if name not in BENCHMARKS:
+            parser.error(f"unknown benchmark: {name}")
+        BENCHMARKS[name]()
+
+
+if __name__ == "__main__":
+    main()
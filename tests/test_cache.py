@@ -0,0 +1,292 @@
+import io
+import os
+import pickle
+import shutil
+import subprocess
+import sys
+import time
+
+import pytest
+
+from vulture import core
+from vulture.cache import MAX_AGE, RunManifest, prune_cache
+from vulture.config import InputError, make_config
+from vulture.utils import ExitCode
+
+from . import call_vulture
+
+
+@pytest.fixture
+def modules(tmp_path):
+    project = tmp_path / "project"
+    project.mkdir()
+    (project / "a.py").write_text(
+        """\
+import os
+
+def foo():
+    return 1
+    print("unreachable")
+"""
+    )
+    (project / "b.py").write_text("foo()\n")
+    (project / "c.py").write_text("foo bar\n")
+    return project
+
+
+def _scavenge(modules, cache_dir, capsys, **kwargs):
+    v = core.Vulture(**kwargs)
+    v.scavenge([modules], cache_dir=cache_dir)
+    scan_exit_code = v.exit_code
+    v.report()
+    return scan_exit_code, capsys.readouterr()
+
+
+def _count_scans(monkeypatch):
+    scanned = []
+    original_scan = core.Vulture.scan
+
+    def scan(self, code, filename=""):
+        scanned.append(filename.name)
+        original_scan(self, code, filename=filename)
+
+    monkeypatch.setattr(core.Vulture, "scan", scan)
+    return scanned
+
+
+def test_warm_cache_matches_cold_run(modules, tmp_path, capsys, monkeypatch):
+    cache_dir = tmp_path / "cache"
+    uncached = _scavenge(modules, None, capsys)
+    cold = _scavenge(modules, cache_dir, capsys)
+    scanned = _count_scans(monkeypatch)
+    warm = _scavenge(modules, cache_dir, capsys)
+    assert uncached == cold == warm
+    assert uncached[0] == ExitCode.InvalidInput
+    assert "invalid syntax" in warm[1].err
+    assert "unused import 'os'" in warm[1].out
+    assert not scanned
+
+
+def test_changed_file_is_rescanned(modules, tmp_path, capsys, monkeypatch):
+    cache_dir = tmp_path / "cache"
+    _scavenge(modules, cache_dir, capsys)
+    (modules / "b.py").write_text("foo()\nos\n")
+    scanned = _count_scans(monkeypatch)
+    result = _scavenge(modules, cache_dir, capsys)
+    assert scanned == ["b.py"]
+    assert "unused import" not in result[1].out
+
+
+def test_options_are_part_of_key(modules, tmp_path, capsys):
+    cache_dir = tmp_path / "cache"
+    _scavenge(modules, cache_dir, capsys)
+    result = _scavenge(modules, cache_dir, capsys, ignore_names=["os"])
+    assert "unused import" not in result[1].out
+
+
+def test_corrupt_cache_entry(modules, tmp_path, capsys):
+    cache_dir = tmp_path / "cache"
+    expected = _scavenge(modules, cache_dir, capsys)
+    for entry in cache_dir.rglob("*.json"):
+        entry.write_bytes(b"garbage")
+    assert _scavenge(modules, cache_dir, capsys) == expected
+    # Entries only contain data, so tampered entries can't run code.
+    for entry in cache_dir.rglob("*.json"):
+        entry.write_bytes(pickle.dumps(core._FileResult))
+    assert _scavenge(modules, cache_dir, capsys) == expected
+    for entry in cache_dir.rglob("*.json"):
+        entry.write_text('["a.py", [[0, "x", 1, 1, 500]], [], [], 0, "", ""]')
+    assert _scavenge(modules, cache_dir, capsys) == expected
+
+
+def test_cache_dir_cmdline(tmp_path):
+    args = ["vulture/", "--cache-dir", str(tmp_path)]
+    assert call_vulture(args) == ExitCode.NoDeadCode
+    assert list(tmp_path.rglob("*.json"))
+    assert call_vulture(args) == ExitCode.NoDeadCode
+
+
+def test_prune_cache(modules, tmp_path, capsys):
+    cache_dir = tmp_path / "cache"
+    _scavenge(modules, cache_dir, capsys)
+    entries = sorted(cache_dir.rglob("*.json"))
+    assert len(entries) == 3
+    stale = time.time() - MAX_AGE - 60
+    os.utime(entries[0], (stale, stale))
+    old_format = entries[0].parent / "old.pickle"
+    old_format.write_bytes(b"")
+    os.utime(old_format, (stale, stale))
+
+    prune_cache(cache_dir)
+    assert sorted(cache_dir.rglob("*.json")) == entries[1:]
+    assert not old_format.exists()
+
+    # The directory is only searched again a day later.
+    os.utime(entries[1], (stale, stale))
+    prune_cache(cache_dir)
+    assert entries[1].exists()
+
+
+def _run_main(args, capsys, monkeypatch):
+    monkeypatch.setattr(sys, "argv", ["vulture", *args])
+    with pytest.raises(SystemExit) as excinfo:
+        core.main()
+    return excinfo.value.code, capsys.readouterr()
+
+
+def test_manifest_replays_unchanged_run(
+    modules, tmp_path, capsys, monkeypatch
+):
+    args = [str(modules), "--cache-dir", str(tmp_path / "cache")]
+    expected = _run_main(args, capsys, monkeypatch)
+    assert expected[0] == ExitCode.DeadCode
+    assert "invalid syntax" in expected[1].err
+    read = []
+    monkeypatch.setattr(core.utils, "read_source", read.append)
+    assert _run_main(args, capsys, monkeypatch) == expected
+    assert read == []
+
+
+def test_manifest_only_records_written_output(tmp_path, monkeypatch):
+    stdout = io.TextIOWrapper(io.BytesIO(), encoding="ascii")
+    monkeypatch.setattr(sys, "stdout", stdout)
+    manifest = RunManifest(tmp_path, {}, [])
+    with manifest.record():
+        # Falls back to printing the encoded text.
+        core.Vulture()._log("\u2603", force=True)
+    replayed = io.StringIO()
+    monkeypatch.setattr(sys, "stdout", replayed)
+    manifest.replay()
+    stdout.seek(0)
+    assert replayed.getvalue() == stdout.read() == "b'\\xe2\\x98\\x83'\n"
+
+
+def test_manifest_not_stored_after_exception(tmp_path):
+    manifest = RunManifest(tmp_path, {}, [])
+    with pytest.raises(KeyboardInterrupt), manifest.record():
+        print("interrupted")
+        raise KeyboardInterrupt
+    manifest.store(ExitCode.NoDeadCode)
+    assert not RunManifest(tmp_path, {}, []).load()
+    with manifest.record():
+        print("complete")
+    manifest.store(ExitCode.NoDeadCode)
+    assert RunManifest(tmp_path, {}, []).load()
+
+
+def test_manifest_detects_changes(modules, tmp_path, capsys, monkeypatch):
+    args = [str(modules), "--cache-dir", str(tmp_path / "cache")]
+    _run_main(args, capsys, monkeypatch)
+    scanned = _count_scans(monkeypatch)
+    replayed = []
+    monkeypatch.setattr(
+        core.RunManifest, "replay", lambda self: replayed.append(True)
+    )
+
+    stat = (modules / "b.py").stat()
+    os.utime(modules / "b.py", ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+    _run_main(args, capsys, monkeypatch)
+    assert replayed == []
+    # Unchanged contents are still taken from the scan cache.
+    assert scanned == []
+    _run_main(args, capsys, monkeypatch)
+    assert replayed == [True]
+
+    (modules / "d.py").write_text("")
+    _run_main(args, capsys, monkeypatch)
+    assert scanned == ["d.py"]
+    assert replayed == [True]
+
+    exit_code, output = _run_main(
+        [*args, "--ignore-names", "os"], capsys, monkeypatch
+    )
+    assert exit_code == ExitCode.DeadCode
+    assert "unused import" not in output.out
+
+
+def test_changed_files_match_full_run(modules, tmp_path, capsys, monkeypatch):
+    changed_files = tmp_path / "changed.txt"
+    changed_files.write_text("")
+    args = [
+        str(modules),
+        "--cache-dir",
+        str(tmp_path / "cache"),
+        "--changed-files",
+        str(changed_files),
+    ]
+    assert _run_main(args, capsys, monkeypatch) == _run_main(
+        [str(modules)], capsys, monkeypatch
+    )
+
+    scanned = _count_scans(monkeypatch)
+    (modules / "b.py").write_text("foo()\nos\n")
+    (modules / "c.py").unlink()
+    (modules / "d.py").write_text("def bar():\n    pass\n")
+    changed_files.write_text(f"{modules / 'b.py'}\n{modules / 'c.py'}\n")
+    result = _run_main(args, capsys, monkeypatch)
+    assert sorted(scanned) == ["b.py", "d.py"]
+    assert result == _run_main([str(modules)], capsys, monkeypatch)
+    assert result[0] == ExitCode.DeadCode
+    assert "unused function 'bar'" in result[1].out
+    assert "unused import" not in result[1].out
+
+
+def test_unlisted_changes_are_detected(modules, tmp_path, capsys, monkeypatch):
+    args = [str(modules), "--cache-dir", str(tmp_path / "cache")]
+    changed_files = tmp_path / "changed.txt"
+    changed_files.write_text("")
+    args += ["--changed-files", str(changed_files)]
+    _run_main(args, capsys, monkeypatch)
+    scanned = _count_scans(monkeypatch)
+
+    # Files with other modification times are compared by content.
+    stat = (modules / "b.py").stat()
+    os.utime(modules / "b.py", ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+    (modules / "c.py").write_text("import json\n")
+    result = _run_main(args, capsys, monkeypatch)
+    assert scanned == ["c.py"]
+    assert result == _run_main([str(modules)], capsys, monkeypatch)
+    assert "unused import 'json'" in result[1].out
+
+
+@pytest.mark.skipif(not shutil.which("git"), reason="requires git")
+def test_changed_since(modules, tmp_path, capsys, monkeypatch):
+    def git(*args):
+        subprocess.run(
+            ["git", "-c", "user.name=a", "-c", "user.email=a@b", *args],
+            cwd=modules,
+            check=True,
+            capture_output=True,
+        )
+
+    git("init")
+    git("add", ".")
+    git("commit", "-m", "Initial commit")
+    monkeypatch.chdir(modules)
+    args = [".", "--cache-dir", str(tmp_path / "cache")]
+    _run_main([*args, "--changed-since", "HEAD"], capsys, monkeypatch)
+    scanned = _count_scans(monkeypatch)
+    (modules / "b.py").write_text("foo()\nos\n")
+    result = _run_main([*args, "--changed-since", "HEAD"], capsys, monkeypatch)
+    assert scanned == ["b.py"]
+    assert result == _run_main(["."], capsys, monkeypatch)
+
+    exit_code, output = _run_main(
+        [*args, "--changed-since", "unknown"], capsys, monkeypatch
+    )
+    assert exit_code == ExitCode.InvalidInput
+    assert "Could not list files changed since unknown" in output.err
+
+
+@pytest.mark.parametrize(
+    "args",
+    [
+        ["--changed-files=changed.txt"],
+        ["--changed-since=-p", "--cache-dir=cache"],
+        ["--changed-since=main", "--changed-files=f", "--cache-dir=cache"],
+        ["--changed-since=main", "--cache-dir=cache", "--stream"],
+    ],
+)
+def test_changed_options(args):
+    with pytest.raises(InputError):
+        make_config([*args, "path"])
@@ -9,10 +9,7 @@ assert v  # Silence pyflakes
 
 def check_condition(code, result):
     condition = ast.parse(code, mode="eval").body
-    if result:
-        assert utils.condition_is_always_true(condition)
-    else:
-        assert utils.condition_is_always_false(condition)
+    assert utils.evaluate_condition(condition) is result
 
 
 def test_false():
@@ -52,8 +49,9 @@ def test_complex_conditions():
     for condition, always_false, always_true in conditions:
         condition = ast.parse(condition, mode="eval").body
         assert not (always_false and always_true)
-        assert utils.condition_is_always_false(condition) == always_false
-        assert utils.condition_is_always_true(condition) == always_true
+        value = utils.evaluate_condition(condition)
+        assert (value is False) == always_false
+        assert (value is True) == always_true
 
 
 def test_errors():
@@ -70,5 +68,39 @@ def test_errors():
     ]
     for condition in conditions:
         condition = ast.parse(condition, mode="eval").body
-        assert not utils.condition_is_always_false(condition)
-        assert not utils.condition_is_always_true(condition)
+        assert utils.evaluate_condition(condition) is None
+
+
+def test_literals():
+    check_condition("-1", True)
+    check_condition("+0.0", False)
+    check_condition("0+0j", False)
+    check_condition("1-2j", True)
+    check_condition("set()", False)
+    check_condition("(0,)", True)
+    check_condition("{(): []}", True)
+    check_condition("{[]: 1}", True)
+    conditions = ["-True", "[foo]", "{**foo}", "set(foo)", "1+2", "f'{x}'"]
+    for condition in conditions:
+        condition = ast.parse(condition, mode="eval").body
+        assert utils.evaluate_condition(condition) is None
+
+
+def test_short_circuit():
+    condition = ast.parse("False and [foo] and chr(-1)", mode="eval").body
+    assert utils.evaluate_condition(condition) is False
+    condition = ast.parse("foo or 1 or bar", mode="eval").body
+    assert utils.evaluate_condition(condition) is True
+
+
+def test_deeply_nested_conditions():
+    condition = ast.Constant(value=1)
+    for _ in range(100001):
+        condition = ast.UnaryOp(op=ast.Not(), operand=condition)
+    assert utils.evaluate_condition(condition) is False
+    literal = ast.Constant(value=0)
+    for _ in range(100000):
+        literal = ast.Tuple(elts=[literal], ctx=ast.Load())
+    assert utils.evaluate_condition(literal) is True
+    literal.elts.append(ast.Name(id="foo", ctx=ast.Load()))
+    assert utils.evaluate_condition(literal) is None
@@ -1,5 +1,9 @@
+import pytest
+
 from vulture import core
 
+from . import REPO
+
 dc = core.DEFAULT_CONFIDENCE
 
 
@@ -83,3 +87,38 @@ async def foo():
 """
     check_min_confidence(code, 50, {"foo": dc})
     check_min_confidence(code, 75, {})
+
+
+@pytest.mark.parametrize("min_confidence", [0, 60, 61, 90, 100])
+def test_confidence_pushdown(min_confidence):
+    def get_report(vulture):
+        vulture.scavenge([REPO / "vulture", REPO / "tests"])
+        return [
+            (item.filename, item.first_lineno, item.name, item.confidence)
+            for item in vulture.get_unused_code(min_confidence=min_confidence)
+        ]
+
+    v = core.Vulture(min_confidence=min_confidence)
+    assert get_report(v) == get_report(core.Vulture())
+
+
+def test_confidence_pushdown_skips_definitions():
+    code = """\
+import foo
+
+class Foo:
+    def bar(self, a):
+        b = 1
+"""
+    v = core.Vulture(min_confidence=100)
+    v.scan(code)
+    assert [item.name for item in v.get_unused_code()] == ["a"]
+    assert len(v.defined_classes) == len(v.defined_methods) == 0
+    assert [item.name for item in v.defined_vars] == ["a"]
+    # Imports are needed for finding the whitelists.
+    assert [item.name for item in v.defined_imports] == ["foo"]
+
+
+def test_invalid_min_confidence():
+    with pytest.raises(ValueError):
+        core.Vulture(min_confidence=101)
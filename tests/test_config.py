@@ -35,8 +35,11 @@ def test_cli_args():
         ignore_decorators=["deco1", "deco2"],
         ignore_names=["name1", "name2"],
         config="pyproject.toml",
+        jobs=4,
         make_whitelist=True,
         min_confidence=10,
+        only_types=["import", "unreachable_code"],
+        skip_type_comments=True,
         sort_by_size=True,
         verbose=True,
     )
@@ -45,8 +48,11 @@ def test_cli_args():
             "--exclude=file*.py,dir/",
             "--ignore-decorators=deco1,deco2",
             "--ignore-names=name1,name2",
+            "--jobs=4",
             "--make-whitelist",
             "--min-confidence=10",
+            "--only-types=import,unreachable_code",
+            "--skip-type-comments",
             "--sort-by-size",
             "--verbose",
             "path1",
@@ -68,6 +74,7 @@ def test_toml_config():
         ignore_names=["name1", "name2"],
         make_whitelist=True,
         min_confidence=10,
+        skip_type_comments=True,
         sort_by_size=True,
         verbose=True,
     )
@@ -80,6 +87,7 @@ def test_toml_config():
         ignore_names = ["name1", "name2"]
         make_whitelist = true
         min_confidence = 10
+        skip_type_comments = true
         sort_by_size = true
         verbose = true
         paths = ["path1", "path2"]
@@ -162,15 +170,28 @@ def test_config_merging():
     ]
     result = make_config(cliargs, toml)
     expected = dict(
+        cache_dir="",
+        changed_files="",
+        changed_since="",
+        emit_partial="",
         paths=["cli_path"],
         exclude=["cli_exclude"],
+        fail_fast=False,
         ignore_decorators=["cli_deco"],
         ignore_names=["cli_name"],
         config="pyproject.toml",
+        jobs=1,
         make_whitelist=True,
         min_confidence=20,
+        only_types=[],
+        serve=False,
+        shard="",
+        socket="",
+        skip_type_comments=False,
         sort_by_size=True,
+        stream=False,
         verbose=True,
+        watch=False,
     )
     assert result == expected
 
@@ -1,5 +1,6 @@
 import codecs
 
+from vulture import core, utils
 from vulture.utils import ExitCode
 
 from . import v
@@ -46,3 +47,45 @@ def test_utf8_with_bom(v, tmp_path):
     filepath.write_text("", encoding="utf-8-sig")
     v.scavenge([filepath])
     assert v.exit_code == ExitCode.NoDeadCode
+
+
+def test_latin1_bytes_with_noqa(v, tmp_path):
+    filepath = tmp_path / "latin1.py"
+    filepath.write_bytes(
+        "# -*- coding: latin-1 -*-\nimport os  # noqa\nx = 'é'\n".encode(
+            "latin-1"
+        )
+    )
+    v.scavenge([filepath])
+    assert v.exit_code == ExitCode.NoDeadCode
+    assert [item.name for item in v.get_unused_code()] == ["x"]
+
+
+def test_invalid_encoding_declaration(v, tmp_path):
+    filepath = tmp_path / "invalid.py"
+    filepath.write_bytes(b"# -*- coding: foobar -*-\npass\n")
+    v.scavenge([filepath])
+    assert v.exit_code == ExitCode.InvalidInput
+
+
+def test_memory_mapped_file(v, tmp_path, monkeypatch):
+    monkeypatch.setattr(utils, "MMAP_THRESHOLD", 1)
+    filepath = tmp_path / "mapped.py"
+    filepath.write_bytes(b"import os\nimport sys  # noqa\n")
+    v.scavenge([filepath])
+    assert [item.name for item in v.get_unused_code()] == ["os"]
+    assert v.code == ["import os", "import sys  # noqa"]
+
+
+def test_scan_bytes(v):
+    v.scan(b"\xef\xbb\xbfimport os\r\n")
+    assert [item.name for item in v.get_unused_code()] == ["os"]
+
+
+def test_lines_are_only_split_when_needed():
+    v = core.Vulture()
+    v.scan(b"import os\n")
+    assert v.code == []
+    v.scan(b"import sys  # NOQA\n")
+    assert v.code == []
+    assert [item.name for item in v.get_unused_code()] == ["os"]
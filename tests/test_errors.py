@@ -1,5 +1,6 @@
 import pytest
 
+from vulture import core
 from vulture.utils import ExitCode
 
 from . import call_vulture, v
@@ -17,6 +18,20 @@ def test_null_byte(v):
     assert int(v.report()) == ExitCode.InvalidInput
 
 
+@pytest.mark.parametrize("branches", [3000, 100000])
+def test_long_elif_chain(tmp_path, capsys, branches):
+    (tmp_path / "a.py").write_text(
+        "if x == 0:\n    pass\n"
+        + "".join(f"elif x == {i}:\n    pass\n" for i in range(1, branches))
+    )
+    (tmp_path / "b.py").write_text("import os\n")
+    v = core.Vulture()
+    v.scavenge([tmp_path])
+    assert [item.name for item in v.get_unused_code()] == ["os"]
+    assert v.exit_code == ExitCode.InvalidInput
+    assert "a.py: invalid source code" in capsys.readouterr().err
+
+
 def test_confidence_range(v):
     v.scan(
         """\
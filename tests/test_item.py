@@ -1,3 +1,5 @@
+import pytest
+
 from . import v
 
 assert v  # Silence pyflakes
@@ -99,3 +101,54 @@ def test_item_variable(v):
     assert var.name == "v"
     assert var.first_lineno == 1
     assert var.last_lineno == 1
+
+
+def test_defined_items_are_materialized_on_demand(v):
+    v.scan("def foo():\n    bar = 1\n", filename="a.py")
+    v.scan("def baz():\n    pass\n", filename="b.py")
+    assert len(v.defined_funcs) == 2
+    assert len(v.defined_vars) == 1
+    assert not v.defined_classes
+    foo, baz = v.defined_funcs
+    assert (foo.name, foo.typ, foo.first_lineno, foo.last_lineno) == (
+        "foo",
+        "function",
+        1,
+        2,
+    )
+    assert foo.confidence == 60
+    assert str(baz.filename) == "b.py"
+    assert v.defined_funcs[-1] == baz
+    assert v.defined_vars[0].filename is foo.filename
+
+
+def test_defined_items_compare_like_lists(v):
+    v.scan("def foo():\n    pass\nbar = 1\ndef baz():\n    pass\n")
+    funcs = list(v.defined_funcs)
+    assert v.defined_funcs == funcs
+    assert v.defined_funcs == tuple(funcs)
+    assert funcs == v.defined_funcs
+    assert v.defined_funcs != funcs[:1]
+    assert v.defined_funcs != v.defined_vars
+    assert v.defined_funcs != "foo"
+    assert v.defined_classes == []
+    assert v.defined_funcs[1:] == funcs[1:]
+    assert v.defined_funcs[-2] == funcs[0]
+    assert v.defined_vars[0].name == "bar"
+    assert funcs[1] in v.defined_funcs
+    with pytest.raises(IndexError):
+        v.defined_funcs[2]
+
+
+def test_item_message(v):
+    v.scan("import os\nreturn\nos\n")
+    assert [item.message for item in v.defined_imports] == [
+        "unused import 'os'"
+    ]
+    assert [item.message for item in v.unreachable_code] == [
+        "unreachable code after 'return'"
+    ]
+    item = v.defined_imports[0]
+    item.message = "custom message"
+    assert item.message == "custom message"
+    assert ":1: custom message (90% confidence)" in item.get_report()
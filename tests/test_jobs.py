@@ -0,0 +1,133 @@
+import ast
+
+from vulture import core
+from vulture.utils import ExitCode
+
+from . import call_vulture
+
+MODULES = {
+    "a.py": """\
+import os
+import sys
+
+def unused_function():
+    return sys.argv
+    print("unreachable")
+""",
+    "b.py": """\
+class Foo:
+    def used_method(self):
+        pass
+
+Foo().used_method()
+""",
+    "c.py": "foo bar",
+    "d.py": """\
+from collections import defaultdict
+
+d = defaultdict(int)
+""",
+}
+
+
+class _NoAttributeUsesVulture(core.Vulture):
+    """Ignore the use of attributes."""
+
+    def visit_Attribute(self, node):
+        if not isinstance(node.ctx, ast.Load):
+            super().visit_Attribute(node)
+
+
+def _report(paths, capsys, **kwargs):
+    v = core.Vulture(verbose=kwargs.pop("verbose", False))
+    v.scavenge(paths, **kwargs)
+    scan_exit_code = v.exit_code
+    v.report(sort_by_size=True)
+    return scan_exit_code, capsys.readouterr(), v.get_unused_code()
+
+
+def _make_modules(tmp_path):
+    for name, code in MODULES.items():
+        (tmp_path / name).write_text(code)
+
+
+def test_parallel_report_matches_serial(tmp_path, capsys):
+    _make_modules(tmp_path)
+    serial = _report([tmp_path], capsys)
+    parallel = _report([tmp_path], capsys, jobs=2)
+    assert serial[0] == parallel[0] == ExitCode.InvalidInput
+    assert serial[1] == parallel[1]
+    assert serial[2] == parallel[2]
+    assert [item.message for item in serial[2]] == [
+        item.message for item in parallel[2]
+    ]
+
+
+def test_parallel_verbose_output_matches_serial(tmp_path, capsys):
+    _make_modules(tmp_path)
+    serial = _report([tmp_path], capsys, verbose=True, exclude=["d.py"])
+    parallel = _report(
+        [tmp_path], capsys, verbose=True, exclude=["d.py"], jobs=3
+    )
+    assert serial[1] == parallel[1]
+    assert "Excluded:" in serial[1].out
+
+
+def test_parallel_whitelists(tmp_path, capsys):
+    _make_modules(tmp_path)
+    (tmp_path / "c.py").unlink()
+    serial = _report([tmp_path], capsys, verbose=True)
+    parallel = _report([tmp_path], capsys, verbose=True, jobs=2)
+    assert "Included whitelist:" in parallel[1].out
+    assert serial[1] == parallel[1]
+    assert serial[0] == parallel[0] == ExitCode.NoDeadCode
+
+
+def test_module_scanner_is_reused(tmp_path):
+    _make_modules(tmp_path)
+    options = core.Vulture()._get_options()
+    results = [
+        core._scan_module_in_worker(core.Vulture, options, tmp_path / name)
+        for name in ["a.py", "c.py", "b.py"]
+    ]
+    scanner = core._module_scanner
+    # Each result only holds the findings of its own module.
+    assert [len(result.definitions) for result in results] == [3, 0, 2]
+    assert results[1].exit_code == ExitCode.InvalidInput
+    assert results[2].exit_code == ExitCode.NoDeadCode
+    assert "sys" in results[0].used_names
+    assert "sys" not in results[2].used_names
+    assert len(results[0].unreachable_code) == 1
+    assert results[2].unreachable_code == []
+    core._scan_module_in_worker(core.Vulture, options, tmp_path / "d.py")
+    assert core._module_scanner is scanner
+    # Other options and classes require a new scanner.
+    options["min_confidence"] = 80
+    core._scan_module_in_worker(core.Vulture, options, tmp_path / "d.py")
+    assert core._module_scanner is not scanner
+    core._scan_module_in_worker(
+        _NoAttributeUsesVulture, options, tmp_path / "d.py"
+    )
+    assert type(core._module_scanner) is _NoAttributeUsesVulture
+
+
+def test_subclass_in_workers(tmp_path):
+    _make_modules(tmp_path)
+    # Results of other classes aren't taken from the cache.
+    core.Vulture().scavenge([tmp_path], cache_dir=tmp_path / "cache")
+    expected = None
+    for kwargs in [{}, {"jobs": 2}, {"cache_dir": tmp_path / "cache"}] * 2:
+        v = _NoAttributeUsesVulture()
+        v.scavenge([tmp_path], **kwargs)
+        names = [item.name for item in v.get_unused_code()]
+        assert "used_method" in names
+        expected = expected or names
+        assert names == expected
+
+
+def test_jobs_cmdline():
+    assert call_vulture(["vulture/", "--jobs", "2"]) == ExitCode.NoDeadCode
+    assert (
+        call_vulture(["vulture/", "--jobs", "0"])
+        == ExitCode.InvalidCmdlineArguments
+    )
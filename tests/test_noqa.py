@@ -1,7 +1,12 @@
 import pytest
 
 from vulture.core import ERROR_CODES
-from vulture.noqa import NOQA_CODE_MAP, NOQA_REGEXP, _parse_error_codes
+from vulture.noqa import (
+    NOQA_CODE_MAP,
+    NOQA_REGEXP,
+    _parse_error_codes,
+    parse_noqa,
+)
 
 from . import check, v
 
@@ -309,3 +314,25 @@ def foo():
     check(v.unused_funcs, ["foo"])
     check(v.unused_imports, [])
     check(v.unused_vars, [])
+
+
+@pytest.mark.parametrize(
+    "code, expected",
+    [
+        ("", {}),
+        ("x = 1\n", {}),
+        (
+            "a  # noqa\nb  # noqa: V104, V107\n",
+            {"all": {1}, "V104": {2}, "V107": {2}},
+        ),
+        # Only the first noqa comment of a line counts.
+        ("a  # noqa: V104  # noqa\n", {"V104": {1}}),
+        # Codes don't continue on the next line.
+        ("a  # noqa:\nV104\n", {"all": {1}}),
+        ("a  # noqa: V104\nV107\n", {"V104": {1}}),
+        # Lines are split like str.splitlines() does.
+        ("a\r\nb\fc  # noqa\x85d  # noqa: F401\n", {"all": {3}, "V104": {4}}),
+    ],
+)
+def test_parse_noqa(code, expected):
+    assert parse_noqa(code) == expected
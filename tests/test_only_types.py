@@ -0,0 +1,81 @@
+import pytest
+
+from vulture import core
+from vulture.utils import ExitCode
+
+from . import REPO, call_vulture, check
+
+CODE = """\
+import os
+import sys
+
+def foo(arg):
+    return sys.argv
+    print("unreachable")
+
+class Bar:
+    pass
+"""
+
+
+def _get_unused_code(only_types):
+    v = core.Vulture(only_types=only_types)
+    v.scavenge([REPO / "vulture", REPO / "tests"])
+    return [
+        (str(item.filename), item.first_lineno, item.typ, item.name)
+        for item in v.get_unused_code()
+    ]
+
+
+def test_only_imports():
+    v = core.Vulture(only_types=["import"])
+    v.scan(CODE)
+    check(v.get_unused_code(), ["os"])
+    check(v.used_names, ["argv", "print", "sys"])
+    assert len(v.defined_funcs) == 0
+    assert v.unreachable_code == []
+
+
+def test_only_unreachable_code():
+    v = core.Vulture(only_types=["unreachable_code"])
+    v.scan(CODE)
+    check(v.get_unused_code(), ["return"])
+    assert v.used_names == set()
+    assert len(v.defined_imports) == 0
+    assert len(v.defined_funcs) == 0
+
+
+def test_only_definitions():
+    v = core.Vulture(only_types=["class", "variable"])
+    v.scan(CODE)
+    check(v.get_unused_code(), ["Bar", "arg"])
+    # Imports are collected for finding the whitelists, but not reported.
+    check(v.defined_imports, ["os", "sys"])
+    check(v.unused_imports, [])
+
+
+@pytest.mark.parametrize(
+    "only_types",
+    [["import"], ["unreachable_code"], ["function", "method", "attribute"]],
+)
+def test_only_types_filters_full_report(only_types):
+    full_report = [
+        entry for entry in _get_unused_code(None) if entry[2] in only_types
+    ]
+    assert _get_unused_code(only_types) == full_report
+
+
+def test_unknown_type():
+    with pytest.raises(ValueError, match="Unknown types: functions"):
+        core.Vulture(only_types=["functions"])
+
+
+def test_only_types_cmdline():
+    assert (
+        call_vulture(["vulture/", "--only-types", "import,unreachable_code"])
+        == ExitCode.NoDeadCode
+    )
+    assert (
+        call_vulture(["vulture/", "--only-types", "imports"])
+        == ExitCode.InvalidCmdlineArguments
+    )
@@ -0,0 +1,198 @@
+import gzip
+
+import pytest
+
+from vulture import core, partial
+from vulture.config import InputError, make_config, parse_shard
+from vulture.utils import ExitCode, VultureInputException
+
+from . import REPO, call_vulture
+
+SHARDS = 3
+
+
+def _get_report(vulture):
+    return [
+        (str(item.filename), item.first_lineno, item.typ, item.name)
+        for item in vulture.get_unused_code()
+    ]
+
+
+def _emit_partials(tmp_path, paths, **kwargs):
+    partial_files = []
+    for index in range(1, SHARDS + 1):
+        partial_file = tmp_path / f"{index}.vpart"
+        v = core.Vulture(**kwargs)
+        partial.emit_partial(v, paths, partial_file, shard=(index, SHARDS))
+        assert v.get_unused_code() == []
+        partial_files.append(partial_file)
+    return partial_files
+
+
+def test_merge_equals_full_run(tmp_path):
+    package = tmp_path / "package"
+    package.mkdir()
+    for index in range(10):
+        previous = (index - 1) % 10
+        (package / f"module{index}.py").write_text(
+            f"import os\n"
+            f"from module{previous} import func{previous}\n"
+            f"def func{index}():\n"
+            f"    return func{previous}()\n"
+            f"    print('unreachable')\n"
+            f"class Class{index}:\n"
+            f"    attr{index} = 1\n"
+        )
+    paths = [package]
+    v = core.Vulture()
+    v.scavenge(paths)
+    full_report = _get_report(v)
+    assert len(full_report) == 40
+
+    v = core.Vulture()
+    partial.merge_partials(v, _emit_partials(tmp_path, paths))
+    assert _get_report(v) == full_report
+    assert v.used_names
+
+
+def test_merge_from_other_checkouts(tmp_path, monkeypatch):
+    roots = [tmp_path / "a", tmp_path / "b"]
+    for root in roots:
+        root.mkdir()
+        for index in range(10):
+            (root / f"module{index}.py").write_text(
+                f"def func{index}():\n    pass\nfunc{(index + 1) % 3}()\n"
+            )
+    monkeypatch.chdir(roots[0])
+    v = core.Vulture()
+    v.scavenge(["."])
+    full_report = _get_report(v)
+    assert len(full_report) == 7
+
+    # Each checkout emits other shards of the same tree.
+    partial_files = []
+    for index in range(1, SHARDS + 1):
+        monkeypatch.chdir(roots[index % 2])
+        partial_file = tmp_path / f"{index}.vpart"
+        partial.emit_partial(
+            core.Vulture(), ["."], partial_file, shard=(index, SHARDS)
+        )
+        partial_files.append(partial_file)
+
+    monkeypatch.chdir(roots[0])
+    v = core.Vulture()
+    partial.merge_partials(v, partial_files)
+    assert _get_report(v) == full_report
+    assert all(item.filename.parent == roots[0] for item in v.defined_funcs)
+
+
+def test_merge_syntax_error(tmp_path, capsys):
+    module = tmp_path / "invalid.py"
+    module.write_text("foo bar")
+    partial_file = tmp_path / "invalid.vpart"
+    v = core.Vulture()
+    partial.emit_partial(v, [module], partial_file)
+    assert v.exit_code == ExitCode.InvalidInput
+    assert "invalid syntax" in capsys.readouterr().err
+
+    v = core.Vulture()
+    partial.merge_partials(v, [partial_file])
+    assert v.exit_code == ExitCode.InvalidInput
+    assert "invalid syntax" in capsys.readouterr().err
+
+
+def test_merge_other_options(tmp_path):
+    partial_files = _emit_partials(tmp_path, [REPO / "vulture"])
+    v = core.Vulture(ignore_names=["foo"])
+    with pytest.raises(VultureInputException, match="incompatible options"):
+        partial.merge_partials(v, partial_files)
+
+
+def test_merge_min_confidence(tmp_path):
+    module = tmp_path / "module.py"
+    module.write_text("import os\n\ndef foo():\n    pass\n")
+    partial_file = tmp_path / "module.vpart"
+    partial.emit_partial(
+        core.Vulture(min_confidence=60), [module], partial_file
+    )
+
+    # Merging may only drop more definitions than the shards did.
+    v = core.Vulture(min_confidence=90)
+    partial.merge_partials(v, [partial_file])
+    assert [item.name for item in v.get_unused_code()] == ["os"]
+    v = core.Vulture(min_confidence=50)
+    with pytest.raises(VultureInputException, match="incompatible options"):
+        partial.merge_partials(v, [partial_file])
+
+
+def test_merge_invalid_files(tmp_path):
+    v = core.Vulture()
+    with pytest.raises(VultureInputException, match="Could not read"):
+        partial.merge_partials(v, [tmp_path / "missing.vpart"])
+
+    invalid_file = tmp_path / "invalid.vpart"
+    invalid_file.write_text("foo")
+    with pytest.raises(VultureInputException, match="not a partial result"):
+        partial.merge_partials(v, [invalid_file])
+
+    partial_file = _emit_partials(tmp_path, [REPO / "vulture"])[0]
+    with gzip.open(partial_file) as f:
+        data = f.read()
+    with gzip.open(invalid_file, "wb") as f:
+        f.write(data[: len(data) // 2])
+    with pytest.raises(VultureInputException, match="incomplete"):
+        list(
+            partial.read_partial(
+                invalid_file,
+                v._get_analysis_options(),
+                core._FileResult.from_record,
+            )
+        )
+
+    # Partial files only contain data, so tampered files can't run code.
+    lines = data.decode("utf-8").splitlines()
+    for record in ["[]", '["a.py", [[0, "x", 1, 1, 500]], [], [], 0, "", ""]']:
+        with gzip.open(invalid_file, "wt", encoding="utf-8") as f:
+            f.write("\n".join([lines[0], record, "null"]))
+        with pytest.raises(VultureInputException, match="invalid results"):
+            partial.merge_partials(v, [invalid_file])
+
+
+def test_merge_cmdline(tmp_path):
+    partial_files = [str(tmp_path / f"{index}.vpart") for index in (1, 2)]
+    for index, partial_file in enumerate(partial_files, start=1):
+        assert (
+            call_vulture(
+                [
+                    "vulture/",
+                    "tests/",
+                    f"--emit-partial={partial_file}",
+                    f"--shard={index}/2",
+                ]
+            )
+            == ExitCode.NoDeadCode
+        )
+    assert call_vulture(["merge", *partial_files]) == ExitCode.NoDeadCode
+    assert (
+        call_vulture(["merge", "--ignore-names=foo", *partial_files])
+        == ExitCode.InvalidInput
+    )
+    assert (
+        call_vulture(["merge", "--min-confidence=90", *partial_files])
+        == ExitCode.NoDeadCode
+    )
+
+
+@pytest.mark.parametrize("shard", ["1", "a/2", "0/2", "3/2", "1/2/3"])
+def test_invalid_shard(shard):
+    with pytest.raises(InputError):
+        parse_shard(shard)
+
+
+def test_shard_options():
+    assert parse_shard("2/3") == (2, 3)
+    assert parse_shard("") is None
+    with pytest.raises(InputError):
+        make_config(["--shard=1/2", "path"])
+    with pytest.raises(InputError):
+        make_config(["--emit-partial=out.vpart", "--sort-by-size", "path"])
@@ -1,3 +1,5 @@
+import ast
+
 from . import check_multiple_unreachable, check_unreachable, v
 
 assert v  # Silence pyflakes
@@ -368,6 +370,13 @@ elif False:
     check_unreachable(v, 3, 2, "if")
 
 
+def test_long_not_chain(v, capsys):
+    v.scan("if " + "not " * 990 + "1:\n    pass\nelse:\n    foo()\n")
+    check_unreachable(v, 4, 1, "else")
+    # Deeply nested nodes are abbreviated in verbose mode.
+    assert "UnaryOp(...)" in capsys.readouterr().out
+
+
 def test_nested_if_statements_false(v):
     v.scan(
         """\
@@ -843,3 +852,56 @@ def foo():
 """
     )
     assert v.unreachable_code == []
+
+
+def test_while_true_fall_through_break_in_handlers(v):
+    v.scan(
+        """\
+while True:
+    try:
+        foo()
+    except ValueError:
+        with bar():
+            break
+print(":-)")
+"""
+    )
+    assert v.unreachable_code == []
+
+
+def test_while_true_fall_through_break_in_loop_else(v):
+    v.scan(
+        """\
+while True:
+    for _ in range(3):
+        pass
+    else:
+        break
+print(":-)")
+"""
+    )
+    assert v.unreachable_code == []
+
+
+def test_while_true_no_fall_through_deeply_nested_loops(v):
+    v.scan(
+        """\
+while True:
+    while True:
+        while True:
+            break
+        if a:
+            break
+print(":-(")
+"""
+    )
+    check_unreachable(v, 7, 1, "while")
+
+
+def test_expressions_have_no_handlers(v):
+    expression_types = [
+        node_type
+        for node_type in v.reachability.handlers
+        if issubclass(node_type, ast.expr)
+    ]
+    assert expression_types == [ast.IfExp]
@@ -61,6 +61,14 @@ def test_item_report(check_report):
     check_report(mock_code, expected)
 
 
+def test_same_line_ignores_case(check_report):
+    expected = """\
+{filename}:1: unused import 'a_b' (90% confidence)
+{filename}:1: unused import 'aB' (90% confidence)
+"""
+    check_report("import aB, a_b\n", expected)
+
+
 def test_make_whitelist(check_report):
     expected = """\
 foo  # unused import ({filename}:1)
@@ -1,7 +1,10 @@
+import ast
+import pathlib
 import sys
 
 import pytest
 
+from vulture import core
 from vulture.utils import ExitCode
 
 from . import check, v
@@ -780,6 +783,54 @@ bad()
     assert v.exit_code == ExitCode.InvalidInput
 
 
+def test_type_comments_only_parsed_if_present(v, monkeypatch):
+    parse_calls = []
+
+    def parse(*args, **kwargs):
+        parse_calls.append(kwargs["type_comments"])
+        return ast_parse(*args, **kwargs)
+
+    ast_parse = ast.parse
+    monkeypatch.setattr(ast, "parse", parse)
+    v.scan("import os\nx = 1  # a comment\n")
+    v.scan(b"import sys\ny = 1  #type :List[int]\n")
+    assert parse_calls == [False, True]
+
+
+def test_type_comments_are_cached(v):
+    core._parse_type_comment.cache_clear()
+    v.scan(
+        """from typing import List
+
+def foo(a):
+    # type: (List[int]) -> None
+    pass
+
+def bar(b):
+    # type: (List[int]) -> None
+    pass
+"""
+    )
+    check(v.unused_imports, [])
+    cache_info = core._parse_type_comment.cache_info()
+    assert (cache_info.hits, cache_info.misses) == (1, 1)
+
+
+def test_skip_type_comments():
+    v = core.Vulture(type_comments=False)
+    v.scan(
+        """from typing import List
+
+def bad():
+    # type: bogus
+    pass
+x = []  # type: List[int]
+"""
+    )
+    check(v.unused_imports, ["List"])
+    assert v.exit_code == ExitCode.NoDeadCode
+
+
 def test_unused_args_with_del(v):
     v.scan(
         """\
@@ -895,3 +946,62 @@ match color:
 
     check(v.unused_classes, [])
     check(v.unused_vars, ["BLUE"])
+
+
+@pytest.mark.skipif(
+    sys.version_info < (3, 10), reason="requires python3.10 or higher"
+)
+def test_match_singleton(v):
+    v.scan(
+        """\
+match value:
+    case True:
+        pass
+    case False | None:
+        pass
+"""
+    )
+    assert v.exit_code == ExitCode.NoDeadCode
+    check(v.used_names, ["value"])
+
+
+def test_deeply_nested_code():
+    # The nesting depth of the AST exceeds the recursion limit.
+    code = "if x == 0:\n    pass\n" + "".join(
+        f"elif x == {i}:\n    y = {i}\n" for i in range(1, 1500)
+    )
+    v = core.Vulture()
+    v.scan(code)
+    assert v.exit_code == ExitCode.NoDeadCode
+    check(v.defined_vars, ["y"] * 1499)
+    check(v.used_names, ["x"])
+
+
+@pytest.mark.skipif(
+    sys.version_info < (3, 12), reason="requires python3.12 or higher"
+)
+def test_type_alias(v):
+    v.scan(
+        """\
+type MyAlias = list[int]
+type UsedAlias = dict[str, int]
+
+x: UsedAlias = {}
+"""
+    )
+    check(v.unused_vars, ["MyAlias", "x"])
+
+
+def test_file_profile(tmp_path, monkeypatch):
+    tests_dir = tmp_path / "tests"
+    tests_dir.mkdir()
+    monkeypatch.chdir(tests_dir)
+    whitelist = pathlib.Path("whitelists") / "sys_whitelist.py"
+    profile = core._FileProfile(whitelist)
+    assert profile.is_test_file
+    assert not profile.is_init_file
+    profile = core._FileProfile(whitelist, is_bundled_whitelist=True)
+    assert not profile.is_test_file
+    profile = core._FileProfile(tmp_path / "pkg" / "__init__.py")
+    assert profile.is_init_file
+    assert profile.display_path == tmp_path / "pkg" / "__init__.py"
@@ -96,3 +96,33 @@ def test_make_whitelist():
 
 def test_version():
     assert call_vulture(["--version"]) == ExitCode.NoDeadCode
+
+
+def test_exclude_directory(tmp_path):
+    venv = tmp_path / "venv"
+    venv.mkdir()
+    (venv / "dead_code.py").write_text("import os\n")
+    (tmp_path / "used.py").write_text("print(1)\n")
+    output = subprocess.run(
+        [sys.executable, "-m", "vulture", str(tmp_path), "-v"],
+        cwd=REPO,
+        capture_output=True,
+        text=True,
+    ).stdout
+    assert "dead_code.py" in output
+    output = subprocess.run(
+        [
+            sys.executable,
+            "-m",
+            "vulture",
+            str(tmp_path),
+            "-v",
+            "--exclude",
+            "venv",
+        ],
+        cwd=REPO,
+        capture_output=True,
+        text=True,
+    ).stdout
+    assert f"Excluded: {venv}" in output
+    assert "dead_code.py" not in output
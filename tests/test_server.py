@@ -0,0 +1,175 @@
+import json
+import socket
+import subprocess
+import sys
+import threading
+import time
+
+import pytest
+
+from vulture.server import AnalysisServer
+from vulture.utils import ExitCode
+
+from . import REPO
+
+
+@pytest.fixture
+def server(tmp_path):
+    (tmp_path / "a.py").write_text("import os\n\ndef foo():\n    pass\n")
+    (tmp_path / "b.py").write_text("foo()\n")
+    server = AnalysisServer({})
+    server.scan([tmp_path])
+    return server
+
+
+def _get_names(report):
+    return [item["name"] for item in report["unused_code"]]
+
+
+def test_report(server, tmp_path):
+    report = server.report()
+    assert report["exit_code"] == ExitCode.DeadCode
+    assert report["errors"] == []
+    assert report["unused_code"] == [
+        {
+            "filename": str(tmp_path / "a.py"),
+            "first_lineno": 1,
+            "last_lineno": 1,
+            "type": "import",
+            "name": "os",
+            "message": "unused import 'os'",
+            "confidence": 90,
+        }
+    ]
+
+
+def test_update_retracts_used_names(server, tmp_path):
+    result = server.update(str(tmp_path / "b.py"), "os.getcwd()\n")
+    assert result["exit_code"] == ExitCode.NoDeadCode
+    assert _get_names(server.report()) == ["foo"]
+
+    # Files are read from disk if no source is given.
+    server.update(str(tmp_path / "b.py"))
+    assert _get_names(server.report()) == ["os"]
+
+
+def test_update_new_file(server, tmp_path):
+    server.update(str(tmp_path / "c.py"), "import os, sys\nsys.exit()\n")
+    assert _get_names(server.report()) == ["os", "os"]
+
+
+def test_remove(server, tmp_path):
+    server.remove(str(tmp_path / "b.py"))
+    assert _get_names(server.report()) == ["os", "foo"]
+    with pytest.raises(ValueError, match="Unknown file"):
+        server.remove(str(tmp_path / "b.py"))
+
+
+def test_exclude_whitelists(tmp_path):
+    (tmp_path / "a.py").write_text(
+        "import threading\nthreading.Thread.daemon = 1\n"
+    )
+    server = AnalysisServer({})
+    server.scan([tmp_path])
+    assert _get_names(server.report()) == []
+    server = AnalysisServer({}, exclude=["threading_whitelist.py"])
+    server.scan([tmp_path])
+    assert _get_names(server.report()) == ["daemon"]
+
+
+def test_syntax_error(server, tmp_path):
+    result = server.update(str(tmp_path / "b.py"), "foo bar\n")
+    assert result["exit_code"] == ExitCode.InvalidInput
+    assert len(result["errors"]) == 1
+    server.remove(str(tmp_path / "a.py"))
+    report = server.report()
+    assert report["exit_code"] == ExitCode.InvalidInput
+    assert report["errors"] == result["errors"]
+    server.update(str(tmp_path / "b.py"), "foo = 1\n")
+    assert server.report()["exit_code"] == ExitCode.DeadCode
+
+
+def test_handle_line(server, tmp_path):
+    def request(line):
+        return json.loads(server.handle_line(line))
+
+    path = str(tmp_path / "b.py")
+    assert request(
+        json.dumps(
+            {
+                "id": 1,
+                "method": "update",
+                "params": {"path": path, "source": "print()"},
+            }
+        )
+    ) == {"id": 1, "result": {"path": path, "exit_code": 0, "errors": []}}
+    response = request('{"id": 2, "method": "report"}')
+    assert response["id"] == 2
+    assert _get_names(response["result"]) == ["os", "foo"]
+    assert request(
+        '{"id": 3, "method": "remove", "params": {"path": "x"}}'
+    ) == {"id": 3, "error": "Unknown file: x"}
+    assert "Unknown method" in request('{"method": "foo"}')["error"]
+    for line in ['{"method": "report", "params": 1}', '{"method": "remove"}']:
+        assert "Invalid params" in request(line)["error"]
+    assert "Invalid JSON" in request("{")["error"]
+    assert request("[]")["error"] == "Requests must be JSON objects"
+    for path in [tmp_path / "missing.py", tmp_path]:
+        line = json.dumps(
+            {"id": 4, "method": "update", "params": {"path": str(path)}}
+        )
+        assert str(path) in request(line)["error"]
+    assert _get_names(server.report()) == ["os", "foo"]
+    line = '{"method": "report", "params": {"min_confidence": 101}}'
+    assert "min_confidence" in request(line)["error"]
+
+
+def test_serve_stdio(tmp_path):
+    (tmp_path / "a.py").write_text("import os\n")
+    requests = [
+        {"id": 1, "method": "report"},
+        {
+            "id": 2,
+            "method": "update",
+            "params": {"path": str(tmp_path / "a.py"), "source": "1 +"},
+        },
+        {"id": 3, "method": "report"},
+    ]
+    process = subprocess.run(
+        [sys.executable, "-m", "vulture", "--serve", str(tmp_path)],
+        cwd=REPO,
+        input="".join(json.dumps(request) + "\n" for request in requests),
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    responses = [json.loads(line) for line in process.stdout.splitlines()]
+    assert [response["id"] for response in responses] == [1, 2, 3]
+    assert _get_names(responses[0]["result"]) == ["os"]
+    assert responses[1]["result"]["exit_code"] == ExitCode.InvalidInput
+    assert responses[2]["result"]["exit_code"] == ExitCode.InvalidInput
+    assert "invalid syntax" in responses[2]["result"]["errors"][0]
+    assert process.stderr == ""
+
+
+@pytest.mark.skipif(
+    not hasattr(socket, "AF_UNIX"), reason="requires Unix sockets"
+)
+def test_serve_socket(server, tmp_path):
+    socket_path = str(tmp_path / "vulture.sock")
+    threading.Thread(
+        target=server.serve, args=(socket_path,), daemon=True
+    ).start()
+    for _ in range(100):
+        try:
+            client = socket.socket(socket.AF_UNIX)
+            client.connect(socket_path)
+            break
+        except OSError:
+            client.close()
+            time.sleep(0.01)
+    with client, client.makefile("rwb") as stream:
+        stream.write(b'{"id": 1, "method": "report"}\n')
+        stream.flush()
+        response = json.loads(stream.readline())
+    assert _get_names(response["result"]) == ["os"]
@@ -0,0 +1,149 @@
+import pytest
+
+from vulture import core
+from vulture.session import Session
+from vulture.utils import ExitCode
+
+from . import REPO
+
+
+def _get_names(v):
+    return [item.name for item in v.get_unused_code()]
+
+
+def test_add_update_remove():
+    v = core.Vulture()
+    v.add_file("a.py", "def foo():\n    pass\n\ndef bar():\n    pass\n")
+    assert _get_names(v) == ["foo", "bar"]
+    v.add_file("b.py", "foo()\n")
+    assert _get_names(v) == ["bar"]
+    assert [item.name for item in v.unused_funcs] == ["bar"]
+    # The session keeps the definitions per file.
+    assert v.defined_funcs == []
+    v.update_file("b.py", "bar()\n")
+    assert _get_names(v) == ["foo"]
+    assert v.used_names == {"bar"}
+    v.remove_file("b.py")
+    assert _get_names(v) == ["foo", "bar"]
+    assert v.used_names == set()
+
+
+def test_used_names_are_reference_counted():
+    v = core.Vulture()
+    v.add_file("a.py", "def foo():\n    pass\n")
+    v.add_file("b.py", "foo()\n")
+    v.add_file("c.py", "foo()\nfoo()\n")
+    v.remove_file("b.py")
+    assert _get_names(v) == []
+    v.update_file("c.py", "print()\n")
+    assert _get_names(v) == ["foo"]
+
+
+def test_read_from_disk(tmp_path):
+    path = tmp_path / "a.py"
+    path.write_text("import os\n")
+    v = core.Vulture()
+    v.add_file(path)
+    assert _get_names(v) == ["os"]
+    path.write_text("import os\nos.sep\n")
+    v.update_file(str(path))
+    assert _get_names(v) == []
+
+
+def test_syntax_error(capsys):
+    v = core.Vulture()
+    v.add_file("a.py", "foo bar\n")
+    assert "invalid syntax" in capsys.readouterr().err
+    assert v.exit_code == ExitCode.InvalidInput
+    v.add_file("b.py", "1 +\n")
+    v.update_file("a.py", "foo = 1\n")
+    assert v.exit_code == ExitCode.InvalidInput
+    v.remove_file("b.py")
+    assert v.exit_code == ExitCode.NoDeadCode
+    assert v.report() == ExitCode.DeadCode
+
+
+def test_unreadable_file(tmp_path, capsys):
+    module = tmp_path / "a.py"
+    module.write_text("# -*- coding: unknown -*-\nx = 1\n")
+    v = core.Vulture()
+    v.add_file(module)
+    assert "Could not read file" in capsys.readouterr().err
+    assert v.exit_code == ExitCode.InvalidInput
+    v.remove_file(module)
+    assert v.exit_code == ExitCode.NoDeadCode
+
+
+def test_whitelists():
+    v = core.Vulture()
+    v.add_file("a.py", "import threading\n")
+    v.add_file("b.py", "import threading\nthreading.Thread.daemon = 1\n")
+    assert "daemon" in v.used_names
+    v.remove_file("a.py")
+    assert "daemon" in v.used_names
+    v.update_file("b.py", "daemon = 1\n")
+    assert "daemon" not in v.used_names
+    assert _get_names(v) == ["daemon"]
+
+
+def test_only_stale_files_are_checked(monkeypatch):
+    checked = []
+    get_unused_entries = Session._get_unused_entries
+
+    def check_file(self, result):
+        checked.append(str(result.filename))
+        return get_unused_entries(self, result)
+
+    monkeypatch.setattr(Session, "_get_unused_entries", check_file)
+    v = core.Vulture()
+    v.add_file("a.py", "def foo():\n    pass\n")
+    v.add_file("b.py", "def bar():\n    pass\n")
+    v.add_file("c.py", "print()\n")
+    assert _get_names(v) == ["foo", "bar"]
+    checked.clear()
+    v.update_file("c.py", "foo()\n")
+    assert _get_names(v) == ["bar"]
+    assert sorted(checked) == ["a.py", "c.py"]
+    checked.clear()
+    assert _get_names(v) == ["bar"]
+    assert checked == []
+
+
+def test_session_matches_scavenge():
+    modules = sorted((REPO / "vulture").glob("*.py"))
+    modules += sorted((REPO / "tests").glob("*.py"))
+    v = core.Vulture()
+    v.scavenge(modules)
+    session = core.Vulture()
+    for module in modules:
+        session.add_file(module)
+    assert session.get_unused_code() == v.get_unused_code()
+    assert session.used_names == v.used_names
+    for module in modules:
+        session.remove_file(module)
+    assert session.get_unused_code() == []
+    assert session.used_names == set()
+
+
+def test_same_line_ignores_case():
+    v = core.Vulture()
+    v.add_file("a.py", "import aB, a_b\n")
+    assert _get_names(v) == ["a_b", "aB"]
+
+
+def test_invalid_calls():
+    v = core.Vulture()
+    v.add_file("a.py", "")
+    with pytest.raises(ValueError, match="already added"):
+        v.add_file("a.py", "")
+    with pytest.raises(ValueError, match="Unknown file"):
+        v.update_file("b.py", "")
+    with pytest.raises(ValueError, match="Unknown file"):
+        v.remove_file("b.py")
+    with pytest.raises(ValueError):
+        v.scan("")
+
+    v = core.Vulture()
+    v.scan("import os\n")
+    with pytest.raises(ValueError):
+        v.add_file("a.py", "")
@@ -1,4 +1,8 @@
-from . import v
+import pytest
+
+from vulture import core
+
+from . import REPO, v
 
 assert v  # Silence pyflakes
 
@@ -22,3 +26,79 @@ def bar():
         "foo",
         "bar",
     ]
+
+
+def test_sorting_same_line(v):
+    v.scan("import os; x = 1; os = 2\nclass Foo: y = 3\n")
+    assert [item.name for item in v.get_unused_code()] == [
+        "os",
+        "os",
+        "x",
+        "Foo",
+        "y",
+    ]
+    assert [item.typ for item in v.get_unused_code()][:2] == [
+        "import",
+        "variable",
+    ]
+
+
+def test_rescan_invalidates_result(v):
+    v.scan("def foo():\n    pass\n", filename="a.py")
+    assert [item.name for item in v.get_unused_code()] == ["foo"]
+    assert [item.name for item in v.unused_funcs] == ["foo"]
+    v.scan("def bar():\n    pass\nfoo()\n", filename="b.py")
+    assert [item.name for item in v.get_unused_code()] == ["bar"]
+    assert [item.name for item in v.unused_funcs] == ["bar"]
+
+
+def test_duplicate_definitions(v):
+    code = "def foo():\n    pass\n"
+    v.scan(code, filename="a.py")
+    v.scan(code, filename="a.py")
+    assert len(v.defined_funcs) == 2
+    assert [item.name for item in v.get_unused_code()] == ["foo"]
+
+
+def test_iter_unused(v):
+    v.scan("import a\nimport b\n", filename="B.py")
+    v.scan("def foo():\n    return\n    a = 1\n", filename="b.py")
+    v.scan("import c\n", filename="a.py")
+    v.scan("import a\n", filename="B.py")
+    iter_unused = v.iter_unused()
+    assert not isinstance(iter_unused, list)
+    # Filenames are compared case-insensitively and duplicates are removed.
+    assert [(str(item.filename), item.name) for item in iter_unused] == [
+        ("a.py", "c"),
+        ("b.py", "foo"),
+        ("B.py", "a"),
+        ("B.py", "b"),
+        ("b.py", "a"),
+        ("b.py", "return"),
+    ]
+
+
+@pytest.mark.parametrize("sort_by_size", [False, True])
+def test_iter_unused_matches_get_unused_code(sort_by_size):
+    def get_entries(items):
+        return [
+            (item.filename, item.first_lineno, item.name) for item in items
+        ]
+
+    v = core.Vulture()
+    v.scavenge([REPO / "vulture", REPO / "tests"])
+    unused_code = get_entries(
+        v.iter_unused(min_confidence=60, sort_by_size=sort_by_size)
+    )
+    assert unused_code == get_entries(
+        v.get_unused_code(min_confidence=60, sort_by_size=sort_by_size)
+    )
+    # Use the cached result.
+    assert unused_code == get_entries(
+        v.iter_unused(min_confidence=60, sort_by_size=sort_by_size)
+    )
+
+
+def test_iter_unused_invalid_confidence(v):
+    with pytest.raises(ValueError):
+        v.iter_unused(min_confidence=101)
@@ -0,0 +1,121 @@
+import subprocess
+import sys
+
+import pytest
+
+from vulture import core
+from vulture.config import InputError, make_config
+from vulture.utils import ExitCode
+
+from . import REPO
+
+MODULES = {
+    "a.py": """\
+import os
+
+def foo():
+    return
+    print("unreachable")
+""",
+    "b.py": "foo bar",
+    "c.py": """\
+while False:
+    pass
+""",
+}
+
+
+@pytest.fixture
+def modules(tmp_path):
+    for name, code in MODULES.items():
+        (tmp_path / name).write_text(code)
+    return tmp_path
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_stream(modules, capsys, jobs):
+    v = core.Vulture(stream=True)
+
+    def scan_module(module):
+        scan_module_orig(module)
+        # Findings are printed before the next file is scanned.
+        output.append(capsys.readouterr().out)
+
+    output = []
+    scan_module_orig = v._scan_module
+    if jobs == 1:
+        v._scan_module = scan_module
+    v.scavenge([modules], jobs=jobs)
+    if jobs == 1:
+        assert output == [
+            f"{modules / 'a.py'}:5: unreachable code after 'return'"
+            " (100% confidence)\n",
+            "",
+            f"{modules / 'c.py'}:1: unsatisfiable 'while' condition"
+            " (100% confidence)\n",
+        ]
+    else:
+        assert capsys.readouterr().out.splitlines() == [
+            f"{modules / 'a.py'}:5: unreachable code after 'return'"
+            " (100% confidence)",
+            f"{modules / 'c.py'}:1: unsatisfiable 'while' condition"
+            " (100% confidence)",
+        ]
+    assert not v.stopped_early
+    assert v.report() == ExitCode.DeadCode
+    assert capsys.readouterr().out.splitlines() == [
+        f"{modules / 'a.py'}:1: unused import 'os' (90% confidence)",
+        f"{modules / 'a.py'}:3: unused function 'foo' (60% confidence)",
+    ]
+
+
+def test_stream_exit_code(capsys):
+    v = core.Vulture(stream=True)
+    v.scan("def foo():\n    return\n    print()\n\nfoo()\n")
+    assert capsys.readouterr().out
+    assert v.report() == ExitCode.DeadCode
+    assert capsys.readouterr().out == ""
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_fail_fast(modules, capsys, jobs):
+    v = core.Vulture(fail_fast=True)
+    v.scavenge([modules], jobs=jobs)
+    assert v.stopped_early
+    assert v.exit_code == ExitCode.DeadCode
+    output = capsys.readouterr()
+    assert output.out == (
+        f"{modules / 'a.py'}:5: unreachable code after 'return'"
+        " (100% confidence)\n"
+    )
+    assert "b.py" not in output.err
+    # Whitelists are not scanned anymore.
+    assert len(v.defined_imports) == 1
+
+
+def test_fail_fast_syntax_error(modules):
+    (modules / "a.py").unlink()
+    v = core.Vulture(fail_fast=True)
+    v.scavenge([modules])
+    assert v.stopped_early
+    assert v.exit_code == ExitCode.InvalidInput
+    assert v.unreachable_code == []
+
+
+def test_fail_fast_cmdline(modules):
+    (modules / "b.py").unlink()
+    assert (
+        subprocess.call(
+            [sys.executable, "-m", "vulture", str(modules), "--fail-fast"],
+            cwd=REPO,
+            stdout=subprocess.DEVNULL,
+        )
+        == ExitCode.DeadCode
+    )
+
+
+def test_stream_incompatible_options():
+    with pytest.raises(InputError):
+        make_config(["--stream", "--sort-by-size", "path"])
+    with pytest.raises(InputError):
+        make_config(["--fail-fast", "--make-whitelist", "path"])
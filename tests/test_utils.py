@@ -1,4 +1,5 @@
 import ast
+import fnmatch
 import os
 import pathlib
 
@@ -155,3 +156,97 @@ def test_get_decorator_name_multiple_callables(decorated):
         code,
         ["@foo", "@bar.prop", "@", "@", "@k.hello", "@"],
     )
+
+
+class TestGetModules:
+    @pytest.fixture
+    def tree(self, tmp_path):
+        for name in [
+            "a.py",
+            "b.txt",
+            "pkg/__init__.py",
+            "pkg/sub/c.py",
+            "venv/lib/d.py",
+        ]:
+            path = tmp_path / name
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text("")
+        return tmp_path
+
+    @staticmethod
+    def get_names(root, modules):
+        return [module.relative_to(root).as_posix() for module in modules]
+
+    def test_walk(self, tree):
+        modules = utils.get_modules([tree])
+        assert not isinstance(modules, list)
+        assert self.get_names(tree, modules) == [
+            "a.py",
+            "pkg/__init__.py",
+            "pkg/sub/c.py",
+            "venv/lib/d.py",
+        ]
+
+    def test_prune_excluded_directories(self, tree):
+        visited = []
+
+        def is_excluded_dir(path):
+            visited.append(path.name)
+            return path.name == "venv"
+
+        modules = utils.get_modules([tree], is_excluded_dir=is_excluded_dir)
+        assert self.get_names(tree, modules) == [
+            "a.py",
+            "pkg/__init__.py",
+            "pkg/sub/c.py",
+        ]
+        assert "lib" not in visited
+
+    def test_overlapping_paths(self, tree):
+        modules = utils.get_modules(
+            [tree / "pkg" / "sub", tree, tree / "a.py"]
+        )
+        assert self.get_names(tree, modules) == [
+            "pkg/sub/c.py",
+            "a.py",
+            "pkg/__init__.py",
+            "venv/lib/d.py",
+        ]
+
+    def test_symlinks(self, tree):
+        (tree / "link.py").symlink_to(tree / "a.py")
+        (tree / "pkg" / "link").symlink_to(tree / "pkg" / "sub")
+        modules = utils.get_modules([tree])
+        assert "link.py" not in self.get_names(tree, modules)
+        assert self.get_names(tree, utils.get_modules([tree / "pkg"])) == [
+            "pkg/__init__.py",
+            "pkg/sub/c.py",
+        ]
+
+    def test_missing_path(self, tree):
+        with pytest.raises(SystemExit):
+            list(utils.get_modules([tree, tree / "missing.py"]))
+
+
+@pytest.mark.parametrize(
+    "patterns, name",
+    [
+        ([], "foo"),
+        (["foo"], "foo"),
+        (["foo"], "foobar"),
+        (["foo*", "ba[rz]"], "baz"),
+        (["foo*", "ba[rz]"], "bay"),
+        (["f?o", "[!a]*"], "a"),
+        (["*/tests/*"], pathlib.Path("/a/tests/b.py")),
+        (["*.py"], "a.PY"),
+        (["*(x)+"], "a(x)+"),
+    ],
+)
+def test_pattern_matcher(patterns, name):
+    for case in [True, False]:
+        matcher = utils.PatternMatcher(patterns, case=case)
+        func = fnmatch.fnmatchcase if case else fnmatch.fnmatch
+        expected = any(func(os.fspath(name), pattern) for pattern in patterns)
+        assert matcher.match(name) == expected
+        # Memoized result.
+        assert matcher.match(name) == expected
@@ -0,0 +1,131 @@
+import shutil
+
+import pytest
+
+from vulture import core
+from vulture.config import InputError, make_config
+from vulture.utils import ExitCode
+from vulture.watch import Watcher
+
+
+@pytest.fixture
+def project(tmp_path):
+    (tmp_path / "a.py").write_text("import os\n")
+    (tmp_path / "pkg").mkdir()
+    (tmp_path / "pkg" / "b.py").write_text("def foo():\n    pass\n")
+    (tmp_path / "venv").mkdir()
+    (tmp_path / "venv" / "c.py").write_text("import sys\n")
+    return tmp_path
+
+
+@pytest.fixture
+def watcher(project, capsys):
+    watcher = Watcher(core.Vulture(), [project], exclude=["venv/"])
+    watcher.scan()
+    assert watcher.report_changes() == ExitCode.DeadCode
+    assert capsys.readouterr().out.splitlines() == [
+        f"{project / 'a.py'}:1: unused import 'os' (90% confidence)",
+        f"{project / 'pkg' / 'b.py'}:1: unused function 'foo'"
+        " (60% confidence)",
+    ]
+    return watcher
+
+
+def test_changed_file(project, watcher, capsys):
+    assert not watcher.poll()
+    (project / "a.py").write_text("import os\nfrom pkg import b\nb.foo()\n")
+    assert watcher.poll()
+    assert watcher.report_changes() == ExitCode.DeadCode
+    assert capsys.readouterr().out.splitlines() == [
+        f"- {project / 'pkg' / 'b.py'}:1: unused function 'foo'"
+        " (60% confidence)",
+    ]
+    (project / "a.py").write_text("import os\nos.foo()\n")
+    assert watcher.poll()
+    assert watcher.report_changes() == ExitCode.NoDeadCode
+    assert capsys.readouterr().out.splitlines() == [
+        f"- {project / 'a.py'}:1: unused import 'os' (90% confidence)",
+    ]
+
+
+def test_new_and_removed_files(project, watcher, capsys):
+    (project / "pkg" / "b.py").unlink()
+    (project / "pkg" / "c.py").write_text("def bar():\n    pass\n")
+    (project / "pkg" / "sub").mkdir()
+    (project / "pkg" / "sub" / "d.py").write_text("bar()\n")
+    (project / "venv" / "d.py").write_text("import sys\n")
+    assert watcher.poll()
+    watcher.report_changes()
+    assert capsys.readouterr().out.splitlines() == [
+        f"- {project / 'pkg' / 'b.py'}:1: unused function 'foo'"
+        " (60% confidence)",
+    ]
+    shutil.rmtree(project / "pkg")
+    assert watcher.poll()
+    watcher.report_changes()
+    assert capsys.readouterr().out == ""
+    (project / "pkg").mkdir()
+    (project / "pkg" / "e.py").write_text("def baz():\n    pass\n")
+    assert watcher.poll()
+    watcher.report_changes()
+    assert capsys.readouterr().out.splitlines() == [
+        f"+ {project / 'pkg' / 'e.py'}:1: unused function 'baz'"
+        " (60% confidence)",
+    ]
+
+
+def test_file_removed_after_stat(project, watcher, monkeypatch, capsys):
+    (project / "a.py").unlink()
+    monkeypatch.setattr(watcher, "_stat", lambda module: (0, 0, 0))
+    assert watcher.poll()
+    watcher.report_changes()
+    assert capsys.readouterr().out.splitlines() == [
+        f"- {project / 'a.py'}:1: unused import 'os' (90% confidence)",
+    ]
+    assert project / "a.py" not in watcher._files
+
+
+def test_exclude_whitelists(project, capsys):
+    (project / "a.py").write_text(
+        "import threading\nthreading.Thread.daemon = 1\n"
+    )
+    exclude = ["threading_whitelist.py", "pkg/", "venv/"]
+    watcher = Watcher(core.Vulture(), [project], exclude=exclude)
+    watcher.scan()
+    watcher.report_changes()
+    assert capsys.readouterr().out.splitlines() == [
+        f"{project / 'a.py'}:2: unused attribute 'daemon' (60% confidence)",
+    ]
+
+
+def test_only_changed_directories_are_listed(project, watcher, monkeypatch):
+    listed = []
+    list_directory = watcher._list_directory
+
+    def list_directory_and_record(directory):
+        listed.append(directory)
+        return list_directory(directory)
+
+    monkeypatch.setattr(watcher, "_list_directory", list_directory_and_record)
+    assert not watcher.poll()
+    assert listed == []
+    (project / "pkg" / "c.py").write_text("")
+    assert watcher.poll()
+    assert listed == [project / "pkg"]
+
+
+def test_syntax_error(project, watcher, capsys):
+    (project / "a.py").write_text("foo bar\n")
+    assert watcher.poll()
+    assert "invalid syntax" in capsys.readouterr().err
+    assert watcher.report_changes() == ExitCode.DeadCode
+    (project / "pkg" / "b.py").write_text("")
+    assert watcher.poll()
+    assert watcher.report_changes() == ExitCode.InvalidInput
+
+
+def test_watch_incompatible_options():
+    with pytest.raises(InputError):
+        make_config(["--watch", "--sort-by-size", "path"])
+    with pytest.raises(InputError):
+        make_config(["--watch", "--serve", "path"])
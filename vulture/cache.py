@@ -0,0 +1,401 @@
+"""
+This module stores the results of scanning single files on disk, so that
+unchanged files don't have to be parsed again in later runs, the output
+of whole runs, so that runs on unchanged trees don't read any file, and
+the results of all files of a project, so that runs for a list of changed
+files only scan these files.
+
+All entries are stored as JSON, so that loading a shared cache can't run
+code. Entries that weren't used for MAX_AGE seconds are removed.
+"""
+
+import hashlib
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+from contextlib import (
+    contextmanager,
+    redirect_stderr,
+    redirect_stdout,
+    suppress,
+)
+from pathlib import Path
+
+from vulture.version import __version__
+
+# Increase when the format of the cached results changes.
+FORMAT_VERSION = 3
+
+# Remove entries that weren't used for this many seconds.
+MAX_AGE = 30 * 24 * 60 * 60
+
+# Refresh the modification time of used entries and look for unused
+# entries at most once per this many seconds.
+_PRUNE_INTERVAL = 24 * 60 * 60
+
+
+def _load(path):
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+            # Mark the entry as used, but don't write on every access.
+            if time.time() - os.fstat(f.fileno()).st_mtime > _PRUNE_INTERVAL:
+                os.utime(path)
+            return data
+    except Exception:
+        # Treat missing, truncated and otherwise unreadable entries as
+        # cache misses.
+        return None
+
+
+def _store(path, data):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Write to a temporary file first, so that concurrent runs never see
+    # partially written entries.
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, separators=(",", ":"))
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def prune_cache(directory):
+    """
+    Remove all files in the cache directory, including entries of older
+    formats and leftover temporary files, that weren't used for MAX_AGE
+    seconds. The directory is only searched once per day.
+    """
+    directory = Path(directory)
+    stamp = directory / "pruned"
+    now = time.time()
+    try:
+        if now - stamp.stat().st_mtime < _PRUNE_INTERVAL:
+            return
+    except OSError:
+        pass
+    try:
+        directory.mkdir(parents=True, exist_ok=True)
+        stamp.touch()
+    except OSError:
+        return
+    for path in directory.rglob("*"):
+        # Concurrent runs may remove the same files.
+        with suppress(OSError):
+            if path.is_file() and now - path.stat().st_mtime > MAX_AGE:
+                path.unlink()
+
+
+class ScanCache:
+    """
+    Content-addressed cache for per-file scan results.
+
+    The key of a file combines the hash of its contents with its path, the
+    Vulture and Python versions, the analysis options and the working
+    directory (which determines how paths are printed in diagnostics).
+    Results are stored as records returned by their get_record() method and
+    ``load_result`` creates results from these records again.
+    """
+
+    def __init__(self, directory, options, load_result):
+        self.directory = Path(directory)
+        self._load_result = load_result
+        context = (
+            FORMAT_VERSION,
+            __version__,
+            sys.version,
+            sorted(options.items()),
+        )
+        self._salt = repr((*context, os.getcwd())).encode()
+
+    def get_key(self, module):
+        """Return the cache key for the module or None if it can't be read."""
+        try:
+            data = module.read_bytes()
+        except OSError:
+            return None
+        digest = hashlib.sha256(self._salt)
+        digest.update(os.fsencode(module) + b"\0")
+        digest.update(data)
+        return digest.hexdigest()
+
+    def _get_path(self, key):
+        return self.directory / key[:2] / f"{key}.json"
+
+    def load(self, key):
+        record = _load(self._get_path(key))
+        if record is None:
+            return None
+        try:
+            return self._load_result(record)
+        except (TypeError, ValueError):
+            return None
+
+    def store(self, key, result):
+        _store(self._get_path(key), result.get_record())
+
+
+class _OutputRecorder(io.TextIOBase):
+    """Pass output through to a stream and record it for replaying."""
+
+    def __init__(self, stream, is_stderr, chunks):
+        self._stream = stream
+        self._is_stderr = is_stderr
+        self._chunks = chunks
+
+    def write(self, text):
+        result = self._stream.write(text)
+        # Only record output that was written successfully.
+        self._chunks.append((self._is_stderr, text))
+        return result
+
+    def flush(self):
+        self._stream.flush()
+
+
+class RunManifest:
+    """
+    Record the output and exit code of a whole run together with the path,
+    size, modification time and inode of every discovered file.
+
+    The manifest is keyed by the effective configuration, the Vulture and
+    Python versions and the working directory. If the stat() metadata of
+    all files still matches in a later run, the run can be replayed without
+    reading or parsing any file.
+    """
+
+    def __init__(self, directory, config, modules):
+        context = (
+            FORMAT_VERSION,
+            __version__,
+            sys.version,
+            sorted(config.items()),
+            os.getcwd(),
+        )
+        key = hashlib.sha256(repr(context).encode()).hexdigest()
+        self._path = Path(directory) / "manifests" / f"{key}.json"
+        self._files = [self._stat(module) for module in modules]
+        self._output = []
+        self._recorded = False
+        self.exit_code = None
+
+    @staticmethod
+    def _stat(module):
+        try:
+            stat = os.stat(module)
+        except OSError:
+            return [str(module), None]
+        # Use lists, which compare equal to the stored JSON arrays.
+        return [str(module), stat.st_size, stat.st_mtime_ns, stat.st_ino]
+
+    def load(self):
+        """Return True if the recorded run can be replayed."""
+        data = _load(self._path)
+        try:
+            if data["files"] != self._files:
+                return False
+            self._output = [
+                (bool(is_stderr), str(text))
+                for is_stderr, text in data["output"]
+            ]
+            self.exit_code = int(data["exit_code"])
+        except (KeyError, TypeError, ValueError):
+            return False
+        return True
+
+    def replay(self):
+        for is_stderr, text in self._output:
+            (sys.stderr if is_stderr else sys.stdout).write(text)
+
+    @contextmanager
+    def record(self):
+        """
+        Record everything written to stdout and stderr in the block. Only
+        runs that leave the block without an exception are stored.
+        """
+        self._output = []
+        self._recorded = False
+        stdout = _OutputRecorder(sys.stdout, False, self._output)
+        stderr = _OutputRecorder(sys.stderr, True, self._output)
+        with redirect_stdout(stdout), redirect_stderr(stderr):
+            yield
+        self._recorded = True
+
+    def store(self, exit_code):
+        if not self._recorded:
+            return
+        self.exit_code = exit_code
+        _store(
+            self._path,
+            {
+                "files": self._files,
+                "output": self._output,
+                "exit_code": exit_code,
+            },
+        )
+
+
+class ProjectIndex:
+    """
+    Store the results of all files of a run together with the size,
+    modification time and content hash of each file, so that later runs
+    only have to scan the changed files again.
+
+    The index is keyed by the analysis options, the scanned paths, the
+    Vulture and Python versions and the working directory. Like ScanCache,
+    it stores records and creates results with ``load_result``.
+    """
+
+    def __init__(self, directory, options, paths, load_result):
+        context = (
+            FORMAT_VERSION,
+            __version__,
+            sys.version,
+            sorted(options.items()),
+            [str(path) for path in paths],
+            os.getcwd(),
+        )
+        key = hashlib.sha256(repr(context).encode()).hexdigest()
+        self._path = Path(directory) / "indexes" / f"{key}.json"
+        self._load_result = load_result
+        self._entries = {}
+
+    @staticmethod
+    def _get_signature(module):
+        try:
+            stat = os.stat(module)
+        except OSError:
+            return None
+        return [stat.st_size, stat.st_mtime_ns]
+
+    @staticmethod
+    def _get_digest(module):
+        try:
+            return hashlib.sha256(Path(module).read_bytes()).hexdigest()
+        except OSError:
+            return None
+
+    def load(self):
+        # Records are only turned into results when they are used.
+        try:
+            self._entries = {
+                Path(module): (signature, digest, record)
+                for module, signature, digest, record in _load(self._path)
+            }
+        except (TypeError, ValueError):
+            self._entries = {}
+
+    def get_result(self, module):
+        """
+        Return the stored result of the module, or None if the module is
+        new or changed since the index was stored. Modules with another
+        size or modification time are only treated as changed if their
+        contents differ, e.g., not after checking out a fresh clone.
+        """
+        entry = self._entries.get(module)
+        if entry is None:
+            return None
+        signature, digest, record = entry
+        new_signature = self._get_signature(module)
+        if new_signature != signature:
+            if new_signature is None or self._get_digest(module) != digest:
+                return None
+            signature = new_signature
+        try:
+            result = self._load_result(record)
+        except (TypeError, ValueError):
+            return None
+        self._entries[module] = (signature, digest, record)
+        return result
+
+    def add_module(self, module):
+        """
+        Remember the size, modification time and content hash of a module
+        before it is scanned again. Changes during the scan are detected in
+        the next run.
+        """
+        self._entries[module] = (
+            self._get_signature(module),
+            self._get_digest(module),
+            None,
+        )
+
+    def store(self, results):
+        """Store the given results of all modules of the run."""
+        entries = []
+        for module, result in results.items():
+            signature, digest, _ = self._entries[module]
+            entries.append(
+                [str(module), signature, digest, result.get_record()]
+            )
+        _store(self._path, entries)
+
+
+def scavenge_changed(
+    vulture, paths, changed_files, cache_dir, exclude=None, jobs=1
+):
+    """
+    Scan the given changed files and all new files again with the Vulture
+    instance and take the results of all other files from the project index
+    in ``cache_dir``. Files are scanned again, too, if their contents differ
+    from the index. The first run creates the index and later runs update
+    it. The unused code is the same as after Vulture.scavenge().
+    """
+    # The core module imports this one.
+    from vulture.core import _FileResult
+
+    modules, exclude_path = vulture._get_modules(paths, exclude)
+    session = vulture._get_session(exclude_path)
+    options = vulture._get_cache_options()
+    index = ProjectIndex(cache_dir, options, paths, _FileResult.from_record)
+    index.load()
+    changed_files = {os.path.abspath(path) for path in changed_files}
+    included = []
+    changed_modules = []
+    results = {}
+    for module in modules:
+        if exclude_path(module):
+            vulture._log("Excluded:", module)
+            continue
+        included.append(module)
+        result = (
+            None
+            if os.path.abspath(module) in changed_files
+            else index.get_result(module)
+        )
+        if result is None:
+            index.add_module(module)
+            changed_modules.append(module)
+        else:
+            results[module] = result
+
+    outputs = {}
+
+    def add_result(result):
+        results[result.filename] = result
+        outputs[result.filename] = result.stdout
+
+    vulture._scan_modules(
+        changed_modules,
+        exclude_path,
+        jobs,
+        ScanCache(cache_dir, options, _FileResult.from_record),
+        handle_result=add_result,
+    )
+    # Print the output of all files in the order of a full run.
+    for module in included:
+        result = results[module]
+        sys.stdout.write(outputs.get(module, ""))
+        sys.stderr.write(result.stderr)
+        session.add(result)
+    vulture._update_session()
+
+    for result in results.values():
+        # Verbose output doesn't belong into the index.
+        result.stdout = ""
+    index.store(results)
@@ -5,6 +5,7 @@ command-line arguments or the pyproject.toml file.
 
 import argparse
 import pathlib
+import socket
 
 try:
     import tomllib
@@ -15,15 +16,28 @@ from .version import __version__
 
 #: Possible configuration options and their respective defaults
 DEFAULTS = {
+    "cache_dir": "",
+    "changed_files": "",
+    "changed_since": "",
     "config": "pyproject.toml",
+    "emit_partial": "",
     "min_confidence": 0,
     "paths": [],
     "exclude": [],
+    "fail_fast": False,
     "ignore_decorators": [],
     "ignore_names": [],
+    "jobs": 1,
     "make_whitelist": False,
+    "only_types": [],
+    "serve": False,
+    "shard": "",
+    "socket": "",
+    "skip_type_comments": False,
     "sort_by_size": False,
+    "stream": False,
     "verbose": False,
+    "watch": False,
 }
 
 
@@ -32,6 +46,24 @@ class InputError(Exception):
         self.message = message
 
 
+def parse_shard(shard):
+    """
+    Parse a shard specification "K/N" and return the tuple (K, N), or None
+    if no shard is given. Raise InputError for invalid specifications.
+    """
+    if not shard:
+        return None
+    try:
+        index, count = (int(part) for part in shard.split("/"))
+    except ValueError:
+        raise InputError(
+            f"--shard must have the form K/N, not {shard!r}"
+        ) from None
+    if not 1 <= index <= count:
+        raise InputError(f"--shard {shard}: K must be between 1 and N")
+    return index, count
+
+
 def _check_input_config(data):
     """
     Checks the types of the values in *data* against the expected types of
@@ -54,8 +86,78 @@ def _check_output_config(config):
 
     Raise InputError if an error is encountered.
     """
-    if not config["paths"]:
+    if not config["paths"] and not config["serve"]:
         raise InputError("Please pass at least one file or directory")
+    if config["jobs"] < 1:
+        raise InputError("--jobs must be a positive integer")
+    if (config["stream"] or config["fail_fast"]) and (
+        config["sort_by_size"] or config["make_whitelist"]
+    ):
+        raise InputError(
+            "--stream and --fail-fast can't be combined with --sort-by-size"
+            " or --make-whitelist"
+        )
+    if config["shard"] and not config["emit_partial"]:
+        raise InputError("--shard requires --emit-partial")
+    parse_shard(config["shard"])
+    if config["emit_partial"] and (
+        config["stream"]
+        or config["fail_fast"]
+        or config["sort_by_size"]
+        or config["make_whitelist"]
+    ):
+        raise InputError(
+            "--emit-partial doesn't report unused code. Pass reporting"
+            " options to the merge command instead."
+        )
+    if config["changed_files"] or config["changed_since"]:
+        if config["changed_files"] and config["changed_since"]:
+            raise InputError(
+                "--changed-files and --changed-since can't be combined"
+            )
+        if not config["cache_dir"]:
+            raise InputError(
+                "--changed-files and --changed-since require --cache-dir"
+            )
+        if config["changed_since"].startswith("-"):
+            raise InputError("--changed-since must be a Git revision")
+        if (
+            config["emit_partial"]
+            or config["serve"]
+            or config["watch"]
+            or config["stream"]
+            or config["fail_fast"]
+        ):
+            raise InputError(
+                "--changed-files and --changed-since can't be combined with"
+                " --emit-partial, --serve, --watch, --stream or --fail-fast"
+            )
+    if config["socket"] and not config["serve"]:
+        raise InputError("--socket requires --serve")
+    if config["socket"] and not hasattr(socket, "AF_UNIX"):
+        raise InputError("--socket is not supported on this platform")
+    if config["serve"] and (
+        config["emit_partial"]
+        or config["stream"]
+        or config["fail_fast"]
+        or config["make_whitelist"]
+    ):
+        raise InputError(
+            "--serve can't be combined with --emit-partial, --stream,"
+            " --fail-fast or --make-whitelist"
+        )
+    if config["watch"] and (
+        config["emit_partial"]
+        or config["serve"]
+        or config["stream"]
+        or config["fail_fast"]
+        or config["sort_by_size"]
+        or config["make_whitelist"]
+    ):
+        raise InputError(
+            "--watch can't be combined with --emit-partial, --serve,"
+            " --stream, --fail-fast, --sort-by-size or --make-whitelist"
+        )
 
 
 def _parse_toml(infile):
@@ -72,13 +174,26 @@ def _parse_toml(infile):
     Example::
 
         [tool.vulture]
+        cache_dir = ".vulture_cache"
+        changed_files = "changed.txt"
+        changed_since = "main"
+        emit_partial = "shard.vpart"
         exclude = ["file*.py", "dir/"]
+        fail_fast = false
         ignore_decorators = ["deco1", "deco2"]
         ignore_names = ["name1", "name2"]
+        jobs = 4
         make_whitelist = true
         min_confidence = 10
+        only_types = ["import", "unreachable_code"]
+        serve = false
+        shard = "1/4"
+        skip_type_comments = true
+        socket = "/tmp/vulture.sock"
         sort_by_size = true
+        stream = false
         verbose = true
+        watch = false
         paths = ["path1", "path2"]
     """
     data = tomllib.load(infile)
@@ -101,7 +216,10 @@ def _parse_args(args=None):
     def csv(exclude):
         return exclude.split(",")
 
-    usage = "%(prog)s [options] [PATH ...]"
+    usage = (
+        "%(prog)s [options] [PATH ...]\n"
+        "       %(prog)s merge [options] PARTIAL_FILE ..."
+    )
     version = f"vulture {__version__}"
     glob_help = "Patterns may contain glob wildcards (*, ?, [abc], [!abc])."
     parser = argparse.ArgumentParser(prog="vulture", usage=usage)
@@ -113,6 +231,37 @@ def _parse_args(args=None):
         help="Paths may be Python files or directories. For each directory"
         " Vulture analyzes all contained *.py files.",
     )
+    parser.add_argument(
+        "--cache-dir",
+        metavar="DIR",
+        default=missing,
+        help="Directory for caching the results of scanning individual"
+        " files. Unchanged files are not parsed again in later runs.",
+    )
+    parser.add_argument(
+        "--changed-files",
+        metavar="FILE",
+        default=missing,
+        help="Only scan the files listed in FILE (one path per line) and"
+        " new files again and take the results of all other files from the"
+        " project index in --cache-dir. Files whose contents differ from"
+        " the index are scanned again, too. Requires --cache-dir.",
+    )
+    parser.add_argument(
+        "--changed-since",
+        metavar="REV",
+        default=missing,
+        help="Like --changed-files, but list the files that differ from"
+        " the Git revision REV and untracked files with git.",
+    )
+    parser.add_argument(
+        "--emit-partial",
+        metavar="FILE",
+        default=missing,
+        help="Write the results of scanning the files to FILE instead of"
+        ' reporting unused code. Use "vulture merge FILE ..." to report'
+        " the unused code of one or more partial result files.",
+    )
     parser.add_argument(
         "--exclude",
         metavar="PATTERNS",
@@ -123,6 +272,13 @@ def _parse_args(args=None):
         f" without glob wildcards is treated as *PATTERN*. Patterns are"
         f" matched against absolute paths.",
     )
+    parser.add_argument(
+        "--fail-fast",
+        action="store_true",
+        default=missing,
+        help="Stop scanning and exit after the first file that contains"
+        " unreachable code or can't be parsed. Implies --stream.",
+    )
     parser.add_argument(
         "--ignore-decorators",
         metavar="PATTERNS",
@@ -140,6 +296,14 @@ def _parse_args(args=None):
         help=f'Comma-separated list of names to ignore (e.g., "visit_*,do_*").'
         f" {glob_help}",
     )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=missing,
+        help="Number of processes used for scanning files in parallel"
+        " (default: 1).",
+    )
     parser.add_argument(
         "--make-whitelist",
         action="store_true",
@@ -154,12 +318,65 @@ def _parse_args(args=None):
         help="Minimum confidence (between 0 and 100) for code to be"
         " reported as unused.",
     )
+    parser.add_argument(
+        "--only-types",
+        metavar="TYPES",
+        type=csv,
+        default=missing,
+        help="Comma-separated list of the types of unused code to report"
+        ' (e.g., "import,unreachable_code"). Analysis steps that are only'
+        " needed for other types are skipped. Types: attribute, class,"
+        " function, import, method, property, variable, unreachable_code.",
+    )
+    parser.add_argument(
+        "--serve",
+        action="store_true",
+        default=missing,
+        help="Scan the given paths, keep the results in memory and answer"
+        " line-delimited JSON requests (update, remove, report) on stdin"
+        " until it is closed.",
+    )
+    parser.add_argument(
+        "--shard",
+        metavar="K/N",
+        default=missing,
+        help="Only scan the files of shard K out of N shards. Each file"
+        " belongs to exactly one shard. Requires --emit-partial.",
+    )
+    parser.add_argument(
+        "--skip-type-comments",
+        action="store_true",
+        default=missing,
+        help='Don\'t parse type comments (e.g., "# type: int"). Names used'
+        " only in type comments are then reported as unused.",
+    )
+    parser.add_argument(
+        "--socket",
+        metavar="PATH",
+        default=missing,
+        help="Answer --serve requests on the Unix socket PATH instead of"
+        " stdin and stdout.",
+    )
     parser.add_argument(
         "--sort-by-size",
         action="store_true",
         default=missing,
         help="Sort unused functions and classes by their lines of code.",
     )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        default=missing,
+        help="Report unreachable code as soon as a file is scanned and all"
+        " other unused code at the end.",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        default=missing,
+        help="Keep running, scan files again when they change and report"
+        " which unused code appeared (+) or disappeared (-).",
+    )
     parser.add_argument(
         "--config",
         type=str,
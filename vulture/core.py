@@ -1,13 +1,20 @@
 import ast
+import heapq
+import io
+import os
 import pkgutil
 import re
 import string
 import sys
-from fnmatch import fnmatch, fnmatchcase
-from functools import partial
+from array import array
+from collections.abc import Sequence
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stderr, redirect_stdout, suppress
+from functools import cache, lru_cache, partial
 from pathlib import Path
 
 from vulture import lines, noqa, utils
+from vulture.cache import RunManifest, ScanCache, prune_cache, scavenge_changed
 from vulture.config import InputError, make_config
 from vulture.reachability import Reachability
 from vulture.utils import ExitCode
@@ -39,30 +46,96 @@ ERROR_CODES = {
     "unreachable_code": "V201",
 }
 
+# Types of definitions, ordered like the reported error codes.
+_DEFINITION_TYPES = (
+    "attribute",
+    "class",
+    "function",
+    "import",
+    "method",
+    "property",
+    "variable",
+)
+_UNREACHABLE_CODE_INDEX = len(_DEFINITION_TYPES)
+
+# Definition types and confidence of the visitors that only define names.
+# All other visitors collect used names (and may define names, too).
+_VISITOR_DEFINITIONS = {
+    "visit_arg": ({"variable"}, 100),
+    "visit_AsyncFunctionDef": (
+        {"function", "method", "property"},
+        DEFAULT_CONFIDENCE,
+    ),
+    "visit_ClassDef": ({"class"}, DEFAULT_CONFIDENCE),
+    "visit_FunctionDef": (
+        {"function", "method", "property"},
+        DEFAULT_CONFIDENCE,
+    ),
+}
+
+# Stack marker used for traversing the AST in post-order.
+_CHILDREN_VISITED = object()
 
-def _get_unused_items(defined_items, used_names):
-    unused_items = [
-        item for item in set(defined_items) if item.name not in used_names
-    ]
-    unused_items.sort(key=lambda item: item.name.lower())
-    return unused_items
+
+def _get_entry_key(first_lineno, type_index, name):
+    """
+    Return the sort key of unused code. Items on the same line are ordered
+    by type and then by name, ignoring case.
+    """
+    return (first_lineno, type_index, name.lower(), name)
 
 
 def _is_special_name(name):
     return name.startswith("__") and name.endswith("__")
 
 
-def _match(name, patterns, case=True):
-    func = fnmatchcase if case else fnmatch
-    return any(func(name, pattern) for pattern in patterns)
+_TEST_FILE_MATCHER = utils.PatternMatcher(
+    ["*/test/*", "*/tests/*", "*/test*.py", "*[-_]test.py"], case=False
+)
+
+
+# Type comments start with "#", "type" and ":" separated by optional spaces
+# or tabs. Sources without such a comment are parsed without type comments.
+_TYPE_COMMENT_STR_REGEXP = re.compile(r"#[ \t]*type[ \t]*:")
+_TYPE_COMMENT_BYTES_REGEXP = re.compile(rb"#[ \t]*type[ \t]*:")
+
+
+def _may_contain_type_comments(source):
+    if isinstance(source, str):
+        return _TYPE_COMMENT_STR_REGEXP.search(source) is not None
+    return _TYPE_COMMENT_BYTES_REGEXP.search(source) is not None
+
+
+@lru_cache(maxsize=4096)
+def _parse_type_comment(type_comment, mode):
+    """
+    Parse a type comment. Legacy code often repeats the same type comments,
+    so the parsed trees are cached. They are only read during the analysis.
+    """
+    return ast.parse(type_comment, filename="<type_comment>", mode=mode)
+
+
+def _get_whitelist_path(import_name):
+    return Path("whitelists") / (import_name + "_whitelist.py")
+
+
+@cache
+def _get_whitelist_data(import_name):
+    """
+    Return the contents of the bundled whitelist for the given import name,
+    or None if there is none. Most imported modules don't have a whitelist,
+    so the failed lookups are cached, too.
+    """
+    try:
+        return pkgutil.get_data(
+            "vulture", str(_get_whitelist_path(import_name))
+        )
+    except OSError:
+        return None
 
 
 def _is_test_file(filename):
-    return _match(
-        filename.resolve(),
-        ["*/test/*", "*/tests/*", "*/test*.py", "*[-_]test.py"],
-        case=False,
-    )
+    return _TEST_FILE_MATCHER.match(filename.resolve())
 
 
 def _assigns_special_variable__all__(node):
@@ -74,34 +147,37 @@ def _assigns_special_variable__all__(node):
     )
 
 
-def _ignore_class(filename, class_name):
-    return _is_test_file(filename) and "Test" in class_name
+def _ignore_class(profile, class_name):
+    return profile.is_test_file and "Test" in class_name
 
 
-def _ignore_import(filename, import_name):
+def _ignore_import(profile, import_name):
     """
     Ignore star-imported names since we can't detect whether they are used.
     Ignore imports from __init__.py files since they're commonly used to
     collect objects from a package.
     """
-    return filename.name == "__init__.py" or import_name == "*"
+    return profile.is_init_file or import_name == "*"
 
 
-def _ignore_function(filename, function_name):
-    return (
+def _ignore_function(profile, function_name):
+    return profile.is_test_file and (
         function_name in PYTEST_FUNCTION_NAMES
         or function_name.startswith("test_")
-    ) and _is_test_file(filename)
+    )
 
 
-def _ignore_method(filename, method_name):
+def _ignore_method(profile, method_name):
     return _is_special_name(method_name) or (
-        (method_name in PYTEST_METHOD_NAMES or method_name.startswith("test_"))
-        and _is_test_file(filename)
+        profile.is_test_file
+        and (
+            method_name in PYTEST_METHOD_NAMES
+            or method_name.startswith("test_")
+        )
     )
 
 
-def _ignore_variable(filename, varname):
+def _ignore_variable(profile, varname):
     """
     Ignore _ (Python idiom), _x (pylint convention) and
     __x__ (special variable or method), but not __x.
@@ -113,17 +189,41 @@ def _ignore_variable(filename, varname):
     )
 
 
+class _FileProfile:
+    """
+    Hold the properties of a file that are needed while scanning it. They
+    are computed once per file instead of once per definition.
+    """
+
+    __slots__ = (
+        "display_path",
+        "is_bundled_whitelist",
+        "is_init_file",
+        "is_test_file",
+    )
+
+    def __init__(self, filename, is_bundled_whitelist=False):
+        self.display_path = utils.format_path(filename)
+        self.is_bundled_whitelist = is_bundled_whitelist
+        self.is_init_file = filename.name == "__init__.py"
+        # Bundled whitelists have paths relative to the package, so they
+        # must not be resolved against the working directory.
+        self.is_test_file = not is_bundled_whitelist and _is_test_file(
+            filename
+        )
+
+
 class Item:
     """
     Hold the name, type and location of defined code.
     """
 
     __slots__ = (
+        "_message",
         "confidence",
         "filename",
         "first_lineno",
         "last_lineno",
-        "message",
         "name",
         "typ",
     )
@@ -143,9 +243,19 @@ class Item:
         self.filename: Path = filename
         self.first_lineno: int = first_lineno
         self.last_lineno: int = last_lineno
-        self.message: str = message or f"unused {typ} '{name}'"
+        # Only store custom messages. Most items are never reported, so we
+        # build the default message on demand.
+        self._message: str = message
         self.confidence: int = confidence
 
+    @property
+    def message(self) -> str:
+        return self._message or f"unused {self.typ} '{self.name}'"
+
+    @message.setter
+    def message(self, message: str):
+        self._message = message
+
     @property
     def size(self):
         assert self.last_lineno >= self.first_lineno
@@ -187,16 +297,334 @@ class Item:
         return hash(self._tuple())
 
 
+class _DefinitionStore:
+    """
+    Store definitions column by column.
+
+    Names are interned, paths are stored once in a file table and numbers are
+    kept in compact arrays. Item objects are only created on demand, e.g.,
+    for definitions that turn out to be unused.
+    """
+
+    def __init__(self, verbose):
+        self._verbose = verbose
+        self.clear()
+
+    def clear(self):
+        """Remove all definitions."""
+        self.filenames = []
+        self._file_ids = {}
+        self._current_file_id = 0
+        self.names = []
+        self.types = array("B")
+        self.file_ids = array("I")
+        self.first_linenos = array("I")
+        self.last_linenos = array("I")
+        self.confidences = array("B")
+        # Rows of the definitions of each type.
+        self.rows_by_type = [array("I") for _ in _DEFINITION_TYPES]
+
+    def __len__(self):
+        return len(self.names)
+
+    def set_file(self, filename):
+        """Store subsequent definitions for the given file."""
+        file_id = self._file_ids.get(filename)
+        if file_id is None:
+            file_id = self._file_ids[filename] = len(self.filenames)
+            self.filenames.append(filename)
+        self._current_file_id = file_id
+
+    def add(self, type_index, name, first_lineno, last_lineno, confidence):
+        if self._verbose:
+            print(f'define {_DEFINITION_TYPES[type_index]} "{name}"')
+        self.add_row(type_index, name, first_lineno, last_lineno, confidence)
+
+    def add_row(self, type_index, name, first_lineno, last_lineno, confidence):
+        self.rows_by_type[type_index].append(len(self.names))
+        self.names.append(sys.intern(name))
+        self.types.append(type_index)
+        self.file_ids.append(self._current_file_id)
+        self.first_linenos.append(first_lineno)
+        self.last_linenos.append(last_lineno)
+        self.confidences.append(confidence)
+
+    def get_rows(self):
+        """Return all definitions as tuples that can be passed to add_row()."""
+        return list(
+            zip(
+                self.types,
+                self.names,
+                self.first_linenos,
+                self.last_linenos,
+                self.confidences,
+            )
+        )
+
+    def get_item(self, row):
+        return Item(
+            self.names[row],
+            _DEFINITION_TYPES[self.types[row]],
+            self.filenames[self.file_ids[row]],
+            self.first_linenos[row],
+            self.last_linenos[row],
+            confidence=self.confidences[row],
+        )
+
+
+class _DefinitionList(Sequence):
+    """
+    List-like view of all definitions of a single type. It compares equal
+    to other sequences of the same Item objects.
+    """
+
+    def __init__(self, store, typ):
+        self._store = store
+        self._type_index = _DEFINITION_TYPES.index(typ)
+        self.typ = typ
+
+    @property
+    def _rows(self):
+        # The store replaces the arrays when it is cleared.
+        return self._store.rows_by_type[self._type_index]
+
+    def add(self, name, first_lineno, last_lineno, confidence):
+        self._store.add(
+            self._type_index, name, first_lineno, last_lineno, confidence
+        )
+
+    def __len__(self):
+        return len(self._rows)
+
+    def get_names(self):
+        names = self._store.names
+        return {names[row] for row in self._rows}
+
+    def __iter__(self):
+        get_item = self._store.get_item
+        for row in self._rows:
+            yield get_item(row)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._store.get_item(row) for row in self._rows[index]]
+        return self._store.get_item(self._rows[index])
+
+    def __eq__(self, other):
+        if not isinstance(other, Sequence) or isinstance(other, str):
+            return NotImplemented
+        return len(self) == len(other) and all(
+            item == other_item for item, other_item in zip(self, other)
+        )
+
+    def __repr__(self):
+        return repr(list(self))
+
+
+def _check_row(type_index, name, first_lineno, last_lineno, confidence):
+    """Return the definition as a tuple if its values can be stored."""
+    if not (
+        isinstance(name, str)
+        and 0 <= type_index < len(_DEFINITION_TYPES)
+        and 0 < first_lineno <= last_lineno < 2**32
+        and 0 <= confidence <= 100
+    ):
+        raise ValueError(f"invalid definition of {name!r}")
+    return (type_index, name, first_lineno, last_lineno, confidence)
+
+
+class _FileResult:
+    """
+    Hold everything that scanning a single file contributed to a Vulture
+    instance, so that results computed elsewhere can be merged in order.
+    """
+
+    __slots__ = (
+        "definitions",
+        "exit_code",
+        "filename",
+        "stderr",
+        "stdout",
+        "unreachable_code",
+        "used_names",
+    )
+
+    def __init__(self, vulture, stdout="", stderr=""):
+        self.filename = vulture.filename
+        self.definitions = vulture._definitions.get_rows()
+        self.unreachable_code = list(vulture.unreachable_code)
+        self.used_names = set(vulture.used_names)
+        self.exit_code = vulture.exit_code
+        self.stdout = stdout
+        self.stderr = stderr
+
+    def get_record(self, directory=None):
+        """
+        Return the result as a list of plain JSON values. Store the filename
+        relative to ``directory`` if the file lies below it.
+        """
+        filename = self.filename
+        if directory is not None:
+            with suppress(ValueError):
+                filename = filename.relative_to(directory)
+        return [
+            str(filename),
+            self.definitions,
+            [
+                [
+                    item.name,
+                    item.typ,
+                    item.first_lineno,
+                    item.last_lineno,
+                    item._message,
+                    item.confidence,
+                ]
+                for item in self.unreachable_code
+            ],
+            sorted(self.used_names),
+            int(self.exit_code),
+            self.stdout,
+            self.stderr,
+        ]
+
+    @classmethod
+    def from_record(cls, record, directory=None):
+        """
+        Create a result from a record returned by get_record() and resolve
+        relative filenames against ``directory``. Raise TypeError or
+        ValueError if the record is invalid.
+        """
+        result = cls.__new__(cls)
+        (
+            filename,
+            definitions,
+            unreachable_code,
+            used_names,
+            exit_code,
+            result.stdout,
+            result.stderr,
+        ) = record
+        result.filename = Path(filename)
+        if directory is not None:
+            result.filename = directory / result.filename
+        result.definitions = [_check_row(*row) for row in definitions]
+        result.unreachable_code = [
+            Item(name, typ, result.filename, first, last, message, confidence)
+            for name, typ, first, last, message, confidence in unreachable_code
+        ]
+        result.used_names = set(used_names)
+        result.exit_code = ExitCode(exit_code)
+        for value in [*result.used_names, result.stdout, result.stderr]:
+            if not isinstance(value, str):
+                raise TypeError(f"expected a string, got {value!r}")
+        return result
+
+
+# Instance that scans single modules in this process. It is reused for all
+# modules scanned with the same class and options to keep its caches.
+_module_scanner = None
+
+
+def _get_module_scanner(cls, options):
+    global _module_scanner
+    if (
+        type(_module_scanner) is not cls
+        or _module_scanner._get_options() != options
+    ):
+        _module_scanner = cls(**options)
+    else:
+        _module_scanner._clear_results()
+    return _module_scanner
+
+
+def _scan_module_in_worker(cls, options, module, source=None):
+    """
+    Scan a single module with an instance of the given Vulture class in a
+    worker process and return its results. Read the module from disk unless
+    its source is given.
+    """
+    vulture = _get_module_scanner(cls, options)
+    stdout = io.StringIO()
+    stderr = io.StringIO()
+    with redirect_stdout(stdout), redirect_stderr(stderr):
+        if source is None:
+            vulture._scan_module(module)
+        else:
+            vulture.scan(source, filename=module)
+    result = _FileResult(vulture, stdout.getvalue(), stderr.getvalue())
+    # Unreadable files are never passed to scan(), which sets the filename.
+    result.filename = Path(module)
+    return result
+
+
+def _scan_whitelist(cls, options, import_name):
+    """Scan the bundled whitelist for the given import name, if any."""
+    module_data = _get_whitelist_data(import_name)
+    if module_data is None:
+        return None
+    path = _get_whitelist_path(import_name)
+    vulture = cls(**options)
+    vulture._scan(
+        module_data, path, _FileProfile(path, is_bundled_whitelist=True)
+    )
+    return _FileResult(vulture)
+
+
 class Vulture(ast.NodeVisitor):
     """Find dead code."""
 
     def __init__(
-        self, verbose=False, ignore_names=None, ignore_decorators=None
+        self,
+        verbose=False,
+        ignore_names=None,
+        ignore_decorators=None,
+        type_comments=True,
+        only_types=None,
+        min_confidence=0,
+        stream=False,
+        fail_fast=False,
     ):
         self.verbose = verbose
+        # Report file-local findings (unreachable code) as soon as a file is
+        # scanned. Stop scanning after the first file with findings or
+        # errors for fail_fast.
+        self.stream = stream or fail_fast
+        self.fail_fast = fail_fast
+        self.stopped_early = False
+        self._streamed_items = 0
+        self.type_comments = type_comments
+
+        if not 0 <= min_confidence <= 100:
+            raise ValueError("min_confidence must be between 0 and 100.")
+        # Definitions below the minimum confidence are never reported, so
+        # they aren't stored.
+        self.min_confidence = min_confidence
+
+        self.only_types = only_types or []
+        unknown_types = set(self.only_types) - set(ERROR_CODES)
+        if unknown_types:
+            raise ValueError(
+                f"Unknown types: {', '.join(sorted(unknown_types))}"
+                f" (choose from {', '.join(ERROR_CODES)})"
+            )
+        report_types = set(self.only_types or ERROR_CODES)
+        self._check_reachability = "unreachable_code" in report_types
+        self._report_type_indexes = {
+            _DEFINITION_TYPES.index(typ)
+            for typ in report_types
+            if typ != "unreachable_code"
+        }
+        # Usage only matters for reporting unused definitions.
+        self._track_usage = bool(self._report_type_indexes)
+        # Imports determine which bundled whitelists are scanned.
+        self._collected_types = report_types | (
+            {"import"} if self._track_usage else set()
+        )
+
+        self._definitions = _DefinitionStore(self.verbose)
 
         def get_list(typ):
-            return utils.LoggingList(typ, self.verbose)
+            return _DefinitionList(self._definitions, typ)
 
         self.defined_attrs = get_list("attribute")
         self.defined_classes = get_list("class")
@@ -205,17 +633,29 @@ class Vulture(ast.NodeVisitor):
         self.defined_methods = get_list("method")
         self.defined_props = get_list("property")
         self.defined_vars = get_list("variable")
-        self.unreachable_code = get_list("unreachable_code")
+        self.unreachable_code = utils.LoggingList(
+            "unreachable_code", self.verbose
+        )
 
         self.used_names = utils.LoggingSet("name", self.verbose)
 
         self.ignore_names = ignore_names or []
         self.ignore_decorators = ignore_decorators or []
+        self._ignore_names_matcher = utils.PatternMatcher(self.ignore_names)
+        self._ignore_decorators_matcher = utils.PatternMatcher(
+            self.ignore_decorators
+        )
 
         self.filename = Path()
+        self.file_profile = _FileProfile(self.filename)
         self.code = []
         self.exit_code = ExitCode.NoDeadCode
         self.noqa_lines = {}
+        # Node schemas for trees with and without type comments.
+        self._node_schemas = {False: {}, True: {}}
+        self._parse_type_comments = False
+        self._unused_code = None
+        self._session = None
 
         report = partial(
             self._define,
@@ -225,35 +665,67 @@ class Vulture(ast.NodeVisitor):
         self.reachability = Reachability(report=report)
 
     def scan(self, code, filename=""):
+        """
+        Scan the given source code, which may be a string or the undecoded
+        contents of a file.
+        """
         filename = Path(filename)
-        self.code = code.splitlines()
-        self.noqa_lines = noqa.parse_noqa(self.code)
+        self._scan(code, filename, _FileProfile(filename))
+
+    def _scan(self, source, filename, profile):
+        self._check_no_session()
+        self._unused_code = None
+        self.code = []
+        self.noqa_lines = {}
         self.filename = filename
+        self.file_profile = profile
+        self._definitions.set_file(filename)
+
+        has_error = False
 
         def handle_syntax_error(e):
+            nonlocal has_error
             text = f' at "{e.text.strip()}"' if e.text else ""
             self._log(
-                f"{utils.format_path(filename)}:{e.lineno}: {e.msg}{text}",
+                f"{profile.display_path}:{e.lineno}: {e.msg}{text}",
                 file=sys.stderr,
                 force=True,
             )
             self.exit_code = ExitCode.InvalidInput
+            has_error = True
 
+        # Type comments only contain used names.
+        self._parse_type_comments = (
+            self.type_comments
+            and self._track_usage
+            and _may_contain_type_comments(source)
+        )
         try:
             node = ast.parse(
-                code, filename=str(self.filename), type_comments=True
+                source,
+                filename=str(self.filename),
+                type_comments=self._parse_type_comments,
             )
         except SyntaxError as err:
             handle_syntax_error(err)
-        except ValueError as err:
-            # ValueError is raised if source contains null bytes.
+        except (MemoryError, RecursionError, ValueError) as err:
+            # ValueError is raised if source contains null bytes. Code that
+            # is nested too deeply, e.g., very long elif chains, exceeds the
+            # recursion limit or overflows the stack of the parser.
             self._log(
-                f'{utils.format_path(filename)}: invalid source code "{err}"',
+                f'{profile.display_path}: invalid source code "{err}"',
                 file=sys.stderr,
                 force=True,
             )
             self.exit_code = ExitCode.InvalidInput
+            has_error = True
         else:
+            # Only decode the source code if it's needed.
+            if self.verbose or noqa.may_contain_noqa(source):
+                text = utils.decode_source(source)
+                self.noqa_lines = noqa.parse_noqa(text)
+                if self.verbose:
+                    self.code = text.splitlines()
             # When parsing type comments, visiting can throw SyntaxError.
             try:
                 self.visit(node)
@@ -263,8 +735,159 @@ class Vulture(ast.NodeVisitor):
         # Reset the reachability internals for every module to reduce memory
         # usage.
         self.reachability.reset()
+        self._finish_file(has_error)
+
+    def _finish_file(self, has_error):
+        """
+        Report the unreachable code found in the file that was just scanned
+        in streaming mode.
+        """
+        if not self.stream:
+            return
+        items = self.unreachable_code[self._streamed_items :]
+        self._streamed_items = len(self.unreachable_code)
+        items.sort(key=lambda item: (item.first_lineno, item.name))
+        for item in items:
+            self._log(item.get_report(), force=True)
+        if self.fail_fast and (items or has_error):
+            self.stopped_early = True
+            if not has_error:
+                self.exit_code = ExitCode.DeadCode
+
+    def _clear_results(self):
+        """Forget the results of all scanned files, but keep the caches."""
+        self._definitions.clear()
+        self.unreachable_code.clear()
+        self.used_names.clear()
+        self.exit_code = ExitCode.NoDeadCode
+        self._unused_code = None
+        self._streamed_items = 0
+        self.stopped_early = False
+
+    def _get_analysis_options(self):
+        """Return the options that influence the results of a scan."""
+        return dict(
+            ignore_names=self.ignore_names,
+            ignore_decorators=self.ignore_decorators,
+            type_comments=self.type_comments,
+            only_types=self.only_types,
+            min_confidence=self.min_confidence,
+        )
+
+    def _get_cache_options(self):
+        """
+        Return the options that cached results depend on. Subclasses may
+        scan differently, so their results are cached separately.
+        """
+        cls = type(self)
+        return dict(
+            self._get_analysis_options(),
+            cls=f"{cls.__module__}.{cls.__qualname__}",
+        )
+
+    def _get_options(self):
+        """Return the keyword arguments needed to clone this instance."""
+        return dict(verbose=self.verbose, **self._get_analysis_options())
+
+    def _merge(self, result):
+        """Add the results of scanning a file in another process."""
+        self._check_no_session()
+        self._unused_code = None
+        sys.stdout.write(result.stdout)
+        sys.stderr.write(result.stderr)
+        self._definitions.set_file(result.filename)
+        for row in result.definitions:
+            self._definitions.add_row(*row)
+        self.unreachable_code.extend(result.unreachable_code)
+        self.used_names.update(result.used_names)
+        has_error = result.exit_code == ExitCode.InvalidInput
+        if has_error:
+            self.exit_code = ExitCode.InvalidInput
+        self._finish_file(has_error)
+
+    def _scan_module(self, module):
+        self._log("Scanning:", module)
+        try:
+            source = utils.read_source(module)
+        except utils.VultureInputException as err:
+            self._log(
+                f"Error: Could not read file {module} - {err}\n"
+                f"Try to change the encoding to UTF-8.",
+                file=sys.stderr,
+                force=True,
+            )
+            self.exit_code = ExitCode.InvalidInput
+            self._finish_file(has_error=True)
+        else:
+            self.scan(source, filename=module)
+
+    def _scan_modules_in_workers(self, modules, jobs):
+        """
+        Scan the modules in separate instances of this class and yield the
+        results in the original order of the modules. Use a process pool if
+        more than one job is requested.
+        """
+        worker = partial(
+            _scan_module_in_worker, type(self), self._get_options()
+        )
+        if jobs > 1 and len(modules) > 1:
+            chunksize = max(1, len(modules) // (jobs * 4))
+            with ProcessPoolExecutor(max_workers=jobs) as executor:
+                try:
+                    yield from executor.map(
+                        worker, modules, chunksize=chunksize
+                    )
+                finally:
+                    # Don't scan the remaining modules if we stop early.
+                    executor.shutdown(cancel_futures=True)
+        else:
+            yield from map(worker, modules)
+
+    def _scan_modules(
+        self, modules, is_excluded, jobs, cache, handle_result=None
+    ):
+        """
+        Scan all modules that are not excluded, reusing cached results where
+        possible. Results are merged in the original order of the modules, so
+        the outcome is identical to scanning them one after another. Pass
+        ``handle_result`` to process the results differently.
+        """
+        handle_result = handle_result or self._merge
+        included = [module for module in modules if not is_excluded(module)]
+        keys = {}
+        cached = {}
+        if cache:
+            for module in included:
+                keys[module] = key = cache.get_key(module)
+                result = key and cache.load(key)
+                if result:
+                    cached[module] = result
+        results = self._scan_modules_in_workers(
+            [module for module in included if module not in cached], jobs
+        )
+        for module in modules:
+            if is_excluded(module):
+                self._log("Excluded:", module)
+            elif module in cached:
+                self._log("Cached:", module)
+                handle_result(cached[module])
+            else:
+                result = next(results)
+                handle_result(result)
+                if keys.get(module):
+                    # Verbose output doesn't belong into the cache.
+                    result.stdout = ""
+                    cache.store(keys[module], result)
+            if self.stopped_early:
+                results.close()
+                break
+
+    def _get_exclude_functions(self, exclude):
+        """
+        Return functions that check whether a path is excluded and whether
+        a directory is excluded together with all files below it.
+        """
 
-    def scavenge(self, paths, exclude=None):
         def prepare_pattern(pattern):
             if not any(char in pattern for char in "*?["):
                 pattern = f"*{pattern}*"
@@ -272,79 +895,303 @@ class Vulture(ast.NodeVisitor):
 
         exclude = [prepare_pattern(pattern) for pattern in (exclude or [])]
 
+        exclude_matcher = utils.PatternMatcher(exclude, case=False)
+
         def exclude_path(path):
-            return _match(path, exclude, case=False)
+            return exclude_matcher.match(path)
 
-        paths = [Path(path) for path in paths]
+        # If a pattern ending with "*" matches the path of a directory
+        # followed by a separator, it matches all files below it, too.
+        exclude_dir_matcher = utils.PatternMatcher(
+            [pattern for pattern in exclude if pattern.endswith("*")],
+            case=False,
+        )
 
-        for module in utils.get_modules(paths):
-            if exclude_path(module):
-                self._log("Excluded:", module)
-                continue
+        def exclude_dir(path):
+            if exclude_dir_matcher.match(f"{path}{os.sep}"):
+                self._log("Excluded:", path)
+                return True
+            return False
 
-            self._log("Scanning:", module)
-            try:
-                module_string = utils.read_file(module)
-            except utils.VultureInputException as err:
-                self._log(
-                    f"Error: Could not read file {module} - {err}\n"
-                    f"Try to change the encoding to UTF-8.",
-                    file=sys.stderr,
-                    force=True,
-                )
-                self.exit_code = ExitCode.InvalidInput
-            else:
-                self.scan(module_string, filename=module)
+        return exclude_path, exclude_dir
 
-        unique_imports = {item.name for item in self.defined_imports}
+    def _get_modules(self, paths, exclude):
+        """
+        Return the modules below the given paths and a function that checks
+        whether a path is excluded.
+        """
+        exclude_path, exclude_dir = self._get_exclude_functions(exclude)
+        paths = [Path(path) for path in paths]
+        modules = utils.get_modules(paths, is_excluded_dir=exclude_dir)
+        return modules, exclude_path
+
+    def _scan_whitelists(self, exclude_path):
+        unique_imports = self.defined_imports.get_names()
         for import_name in unique_imports:
-            path = Path("whitelists") / (import_name + "_whitelist.py")
+            path = _get_whitelist_path(import_name)
             if exclude_path(path):
                 self._log("Excluded whitelist:", path)
             else:
-                try:
-                    module_data = pkgutil.get_data("vulture", str(path))
-                    self._log("Included whitelist:", path)
-                except OSError:
-                    # Most imported modules don't have a whitelist.
+                module_data = _get_whitelist_data(import_name)
+                if module_data is None:
                     continue
-                assert module_data is not None
-                module_string = module_data.decode("utf-8")
-                self.scan(module_string, filename=path)
+                self._log("Included whitelist:", path)
+                self._scan(
+                    module_data,
+                    path,
+                    _FileProfile(path, is_bundled_whitelist=True),
+                )
+
+    def scavenge(self, paths, exclude=None, jobs=1, cache_dir=None):
+        modules, exclude_path = self._get_modules(paths, exclude)
+        self._scavenge_modules(modules, exclude_path, jobs, cache_dir)
+
+    def _scavenge_modules(self, modules, exclude_path, jobs, cache_dir):
+        if cache_dir or jobs > 1:
+            modules = list(modules)
+            cache = cache_dir and ScanCache(
+                cache_dir, self._get_cache_options(), _FileResult.from_record
+            )
+            self._scan_modules(modules, exclude_path, jobs, cache)
+        else:
+            for module in modules:
+                if exclude_path(module):
+                    self._log("Excluded:", module)
+                else:
+                    self._scan_module(module)
+                    if self.stopped_early:
+                        break
+
+        if self.stopped_early:
+            return
+
+        self._scan_whitelists(exclude_path)
+
+    def _check_no_session(self):
+        if self._session is not None:
+            raise ValueError(
+                "Code can't be scanned after adding files with add_file()"
+            )
+
+    def _get_session(self, exclude_path=None):
+        """
+        Return the session and create it if needed. ``exclude_path`` only
+        applies to a new session.
+        """
+        if self._session is None:
+            if self._definitions.filenames or self.used_names:
+                raise ValueError(
+                    "Files can't be added after scanning code with scan()"
+                    " or scavenge()"
+                )
+            # The session module builds on this one.
+            from vulture.session import Session
+
+            self._session = Session(self, exclude_path)
+        return self._session
+
+    def _add_result(self, result):
+        """Add or replace the result of a file managed by the session."""
+        self._get_session().add(result)
+        self._update_session()
+
+    def _update_session(self):
+        self._unused_code = None
+        self.exit_code = (
+            ExitCode.InvalidInput
+            if self._session.error_files
+            else ExitCode.NoDeadCode
+        )
+
+    def _scan_file(self, path, source):
+        result = _scan_module_in_worker(
+            type(self), self._get_options(), path, source
+        )
+        sys.stdout.write(result.stdout)
+        sys.stderr.write(result.stderr)
+        return result
+
+    def add_file(self, path, source=None):
+        """
+        Scan a file and add it to the session. Read the file from disk
+        unless its source is given.
+
+        Files in the session can be updated and removed later, and
+        get_unused_code() only checks the code affected by such changes
+        again. The bundled whitelists for imported modules are added and
+        removed automatically. The unused code of the session is available
+        through get_unused_code(), iter_unused() and the unused_*
+        properties. The defined_* lists and unreachable_code stay empty in a
+        session. Sessions can't be combined with scan() and scavenge().
+        """
+        path = Path(path)
+        if path in self._get_session().results:
+            raise ValueError(f"File was already added: {path}")
+        self._add_result(self._scan_file(path, source))
+
+    def update_file(self, path, source=None):
+        """
+        Scan a file of the session again and replace what it contributed.
+        Read the file from disk unless its source is given.
+        """
+        path = Path(path)
+        if path not in self._get_session().results:
+            raise ValueError(f"Unknown file: {path}")
+        self._add_result(self._scan_file(path, source))
+
+    def remove_file(self, path):
+        """Remove a file and everything it contributed from the session."""
+        path = Path(path)
+        session = self._get_session()
+        if path not in session.results:
+            raise ValueError(f"Unknown file: {path}")
+        session.remove(path)
+        self._update_session()
 
     def get_unused_code(
         self, min_confidence=0, sort_by_size=False
     ) -> list[Item]:
         """
         Return ordered list of unused Item objects.
+
+        Items below the minimum confidence passed to the constructor are
+        never reported, since they aren't stored in the first place.
+        """
+        self._resolve_unused_code()
+        return list(self.iter_unused(min_confidence, sort_by_size))
+
+    def iter_unused(self, min_confidence=0, sort_by_size=False):
+        """
+        Yield the unused Item objects in the order of get_unused_code(),
+        i.e., ordered by filename and line number or by size.
+
+        Items are produced one file at a time, so this uses much less memory
+        than get_unused_code() for large code bases. Only sorting by size
+        needs to look at all unused items first.
         """
         if not 0 <= min_confidence <= 100:
             raise ValueError("min_confidence must be between 0 and 100.")
+        min_confidence = max(min_confidence, self.min_confidence)
+
+        if self._session is not None:
+            self._resolve_unused_code()
+        if self._unused_code is not None:
+            entries = (
+                item
+                for item in self._unused_code
+                if item.confidence >= min_confidence
+            )
+        else:
+            entries = self._iter_unused_entries(min_confidence)
+        if sort_by_size:
+            # The sort is stable, so items of equal size stay ordered by
+            # filename and line number.
+            entries = sorted(entries, key=self._get_entry_size)
+        return map(self._get_entry_item, entries)
+
+    def _get_entry_item(self, entry):
+        if isinstance(entry, Item):
+            return entry
+        return self._definitions.get_item(entry)
+
+    def _get_entry_size(self, entry):
+        if isinstance(entry, Item):
+            return entry.size
+        store = self._definitions
+        return store.last_linenos[entry] - store.first_linenos[entry] + 1
+
+    def _iter_unused_entries(self, min_confidence):
+        """
+        Yield the unused definitions (as rows of the definition store) and
+        the unreachable code (as Item objects) ordered by filename, line
+        number, type and name.
 
-        def by_name(item):
-            return str(item.filename).lower(), item.first_lineno
-
-        def by_size(item):
-            return item.size, *by_name(item)
-
-        unused_code = (
-            self.unused_attrs
-            + self.unused_classes
-            + self.unused_funcs
-            + self.unused_imports
-            + self.unused_methods
-            + self.unused_props
-            + self.unused_vars
-            + self.unreachable_code
-        )
+        Find the unused names with a single set difference and group the
+        unused rows by file. The groups are then sorted and merged one file
+        at a time instead of sorting one list of all unused items.
+        """
+        store = self._definitions
+        names = store.names
+        types = store.types
+        file_ids = store.file_ids
+        first_linenos = store.first_linenos
+        unused_names = set(names) - self.used_names
+        report_type_indexes = self._report_type_indexes
+
+        rows_by_file = {}
+        for row, name in enumerate(names):
+            if (
+                name in unused_names
+                and types[row] in report_type_indexes
+                and store.confidences[row] >= min_confidence
+            ):
+                rows_by_file.setdefault(file_ids[row], []).append(row)
+
+        # Filenames are compared case-insensitively, so a group may contain
+        # multiple files.
+        file_ids_by_name = {}
+        for file_id in rows_by_file:
+            file_ids_by_name.setdefault(
+                str(store.filenames[file_id]).lower(), []
+            ).append(file_id)
+        unreachable_by_name = {}
+        for item in self.unreachable_code:
+            if item.confidence >= min_confidence:
+                unreachable_by_name.setdefault(
+                    str(item.filename).lower(), []
+                ).append(item)
+
+        for name in sorted(file_ids_by_name.keys() | unreachable_by_name):
+            entries = []
+            # Duplicate definitions (e.g., from scanning a file twice) are
+            # only reported once.
+            seen = set()
+            rows = heapq.merge(
+                *(
+                    rows_by_file[file_id]
+                    for file_id in file_ids_by_name.get(name, [])
+                )
+            )
+            for row in rows:
+                key = _get_entry_key(
+                    first_linenos[row], types[row], names[row]
+                )
+                if (file_ids[row], key) not in seen:
+                    seen.add((file_ids[row], key))
+                    entries.append((key, row))
+            entries.extend(
+                (
+                    _get_entry_key(
+                        item.first_lineno, _UNREACHABLE_CODE_INDEX, item.name
+                    ),
+                    item,
+                )
+                for item in unreachable_by_name.get(name, [])
+            )
+            entries.sort(key=lambda entry: entry[0])
+            for _, entry in entries:
+                yield entry
 
-        confidently_unused = [
-            obj for obj in unused_code if obj.confidence >= min_confidence
+    def _resolve_unused_code(self):
+        """
+        Compute all unused items in a single pass and cache the result until
+        the next scan. Unreachable code is always reported.
+        """
+        if self._unused_code is None and self._session is not None:
+            self._unused_code = self._session.get_unused_code()
+        elif self._unused_code is None:
+            self._unused_code = [
+                self._get_entry_item(entry)
+                for entry in self._iter_unused_entries(self.min_confidence)
+            ]
+        return self._unused_code
+
+    def _get_unused_items(self, typ):
+        unused_items = [
+            item for item in self._resolve_unused_code() if item.typ == typ
         ]
-
-        return sorted(
-            confidently_unused, key=by_size if sort_by_size else by_name
-        )
+        unused_items.sort(key=lambda item: item.name.lower())
+        return unused_items
 
     def report(
         self, min_confidence=0, sort_by_size=False, make_whitelist=False
@@ -352,9 +1199,14 @@ class Vulture(ast.NodeVisitor):
         """
         Print ordered list of Item objects to stdout.
         """
-        for item in self.get_unused_code(
+        if self._streamed_items:
+            self.exit_code = ExitCode.DeadCode
+        for item in self.iter_unused(
             min_confidence=min_confidence, sort_by_size=sort_by_size
         ):
+            if self.stream and item.typ == "unreachable_code":
+                # Already reported after scanning the file.
+                continue
             self._log(
                 item.get_whitelist_string()
                 if make_whitelist
@@ -366,31 +1218,31 @@ class Vulture(ast.NodeVisitor):
 
     @property
     def unused_classes(self):
-        return _get_unused_items(self.defined_classes, self.used_names)
+        return self._get_unused_items("class")
 
     @property
     def unused_funcs(self):
-        return _get_unused_items(self.defined_funcs, self.used_names)
+        return self._get_unused_items("function")
 
     @property
     def unused_imports(self):
-        return _get_unused_items(self.defined_imports, self.used_names)
+        return self._get_unused_items("import")
 
     @property
     def unused_methods(self):
-        return _get_unused_items(self.defined_methods, self.used_names)
+        return self._get_unused_items("method")
 
     @property
     def unused_props(self):
-        return _get_unused_items(self.defined_props, self.used_names)
+        return self._get_unused_items("property")
 
     @property
     def unused_vars(self):
-        return _get_unused_items(self.defined_vars, self.used_names)
+        return self._get_unused_items("variable")
 
     @property
     def unused_attrs(self):
-        return _get_unused_items(self.defined_attrs, self.used_names)
+        return self._get_unused_items("attribute")
 
     def _log(self, *args, file=None, force=False):
         if self.verbose or force:
@@ -435,18 +1287,23 @@ class Vulture(ast.NodeVisitor):
     ):
         def ignored(lineno):
             return (
-                (ignore and ignore(self.filename, name))
-                or _match(name, self.ignore_names)
+                (ignore and ignore(self.file_profile, name))
+                or self._ignore_names_matcher.match(name)
                 or noqa.ignore_line(self.noqa_lines, lineno, ERROR_CODES[typ])
             )
 
-        last_node = last_node or first_node
         typ = collection.typ
+        if typ not in self._collected_types or (
+            confidence < self.min_confidence and typ != "import"
+        ):
+            # Imports are needed for finding the whitelists.
+            return
+        last_node = last_node or first_node
         first_lineno = lines.get_first_line_number(first_node)
 
         if ignored(first_lineno):
             self._log(f'Ignoring {typ} "{name}"')
-        else:
+        elif collection is self.unreachable_code:
             collection.append(
                 Item(
                     name,
@@ -458,6 +1315,13 @@ class Vulture(ast.NodeVisitor):
                     confidence=confidence,
                 )
             )
+        else:
+            collection.add(
+                name,
+                first_lineno,
+                lines.get_last_line_number(last_node),
+                confidence,
+            )
 
     def _define_variable(self, name, node, confidence=DEFAULT_CONFIDENCE):
         self._define(
@@ -549,8 +1413,8 @@ class Vulture(ast.NodeVisitor):
 
     def visit_ClassDef(self, node):
         for decorator in node.decorator_list:
-            if _match(
-                utils.get_decorator_name(decorator), self.ignore_decorators
+            if self._ignore_decorators_matcher.match(
+                utils.get_decorator_name(decorator)
             ):
                 self._log(
                     f'Ignoring class "{node.name}" (decorator whitelisted)'
@@ -581,7 +1445,8 @@ class Vulture(ast.NodeVisitor):
             typ = "function"
 
         if any(
-            _match(name, self.ignore_decorators) for name in decorator_names
+            self._ignore_decorators_matcher.match(name)
+            for name in decorator_names
         ):
             self._log(f'Ignoring {typ} "{node.name}" (decorator whitelisted)')
         elif typ == "property":
@@ -622,62 +1487,231 @@ class Vulture(ast.NodeVisitor):
         for kwd_attr in node.kwd_attrs:
             self.used_names.add(kwd_attr)
 
+    def _get_node_schema(self, node_type, type_comments):
+        """
+        Compute and store how nodes of the given type are visited.
+
+        The schema is a tuple of the visitor method (or None), the fields that
+        may hold child nodes, the mode for parsing type comments (None if
+        the node type has no type comments or they are not parsed) and the
+        reachability handler (None for nodes that don't affect
+        reachability, e.g., most expressions). Return None for node types
+        that have no children and are irrelevant for the analysis (e.g.,
+        ast.Load and operators), so that the traversal can skip them.
+        """
+        visitor_name = "visit_" + node_type.__name__
+        visitor = getattr(self, visitor_name, None)
+        if visitor and not self._is_visitor_needed(visitor_name):
+            visitor = None
+        reachability_handler = (
+            self.reachability.handlers.get(node_type)
+            if self._check_reachability
+            else None
+        )
+        child_fields = node_type._fields
+        if not type_comments or "type_comment" not in node_type._fields:
+            type_comment_mode = None
+        elif issubclass(node_type, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            type_comment_mode = "func_type"
+        else:
+            type_comment_mode = "eval"
+        if (
+            visitor is None
+            and not child_fields
+            and type_comment_mode is None
+            and reachability_handler is None
+            # Log all statements in verbose mode.
+            and not (self.verbose and issubclass(node_type, ast.stmt))
+        ):
+            schema = None
+        else:
+            schema = (
+                visitor,
+                child_fields,
+                type_comment_mode,
+                reachability_handler,
+            )
+        self._node_schemas[type_comments][node_type] = schema
+        return schema
+
+    def _is_visitor_needed(self, visitor_name):
+        """Return False if the visitor can't contribute to the report."""
+        try:
+            definition_types, confidence = _VISITOR_DEFINITIONS[visitor_name]
+        except KeyError:
+            return self._track_usage
+        if confidence < self.min_confidence:
+            return False
+        return not definition_types.isdisjoint(self._collected_types)
+
     def visit(self, node):
-        # Visit children nodes first to allow recursive reachability analysis.
-        self.generic_visit(node)
+        """
+        Traverse the tree rooted at node in post-order.
 
-        self.reachability.visit(node)
+        Children are visited before their parent to allow recursive
+        reachability analysis. We use an explicit stack instead of recursion,
+        which is faster and doesn't hit the recursion limit for deeply nested
+        code.
+        """
+        type_comments = self._parse_type_comments
+        schemas = self._node_schemas[type_comments]
+        # A marker on the stack signals that the children of the node below
+        # it have been visited.
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            if node is _CHILDREN_VISITED:
+                node = stack.pop()
+                self._visit_node(node, schemas[node.__class__], stack)
+                continue
+            try:
+                schema = schemas[node.__class__]
+            except KeyError:
+                schema = self._get_node_schema(node.__class__, type_comments)
+            if schema is None:
+                continue
+            stack.append(node)
+            stack.append(_CHILDREN_VISITED)
+            children = []
+            # Fields also hold names, constants and other non-node values.
+            for field in schema[1]:
+                value = getattr(node, field, None)
+                if isinstance(value, list):
+                    children.extend(
+                        item for item in value if isinstance(item, ast.AST)
+                    )
+                elif isinstance(value, ast.AST):
+                    children.append(value)
+            children.reverse()
+            stack.extend(children)
+
+    def _visit_node(self, node, schema, stack):
+        """Called for each node after all of its children were visited."""
+        visitor, _, type_comment_mode, reachability_handler = schema
+        if reachability_handler:
+            reachability_handler(node)
 
-        method = "visit_" + node.__class__.__name__
-        visitor = getattr(self, method, None)
         if self.verbose:
             lineno = getattr(node, "lineno", 1)
             line = self.code[lineno - 1] if self.code else ""
-            self._log(lineno, ast.dump(node), line)
+            try:
+                dump = ast.dump(node)
+            except RecursionError:
+                # ast.dump() recurses into the children of the node.
+                dump = f"{node.__class__.__name__}(...)"
+            self._log(lineno, dump, line)
         if visitor:
             visitor(node)
 
-        # There isn't a clean subset of node types that might have type
-        # comments, so just check all of them.
-        type_comment = getattr(node, "type_comment", None)
-        if type_comment is not None:
-            mode = (
-                "func_type"
-                if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef))
-                else "eval"
-            )
-            self.visit(
-                ast.parse(type_comment, filename="<type_comment>", mode=mode)
-            )
+        if type_comment_mode is not None:
+            type_comment = node.type_comment
+            if type_comment is not None:
+                # Visit the parsed type comment before continuing with the
+                # siblings of the node.
+                stack.append(
+                    _parse_type_comment(type_comment, type_comment_mode)
+                )
+
+
+def _report(vulture, config):
+    """Report the unused code unless scanning stopped early."""
+    if vulture.stopped_early:
+        return vulture.exit_code
+    return vulture.report(
+        min_confidence=config["min_confidence"],
+        sort_by_size=config["sort_by_size"],
+        make_whitelist=config["make_whitelist"],
+    )
+
 
-    def generic_visit(self, node):
-        """Called if no explicit visitor function exists for a node."""
-        for _, value in ast.iter_fields(node):
-            if isinstance(value, list):
-                for item in value:
-                    if isinstance(item, ast.AST):
-                        self.visit(item)
-            elif isinstance(value, ast.AST):
-                self.visit(value)
+def _scavenge(vulture, config):
+    vulture.scavenge(
+        config["paths"], exclude=config["exclude"], jobs=config["jobs"]
+    )
+    return _report(vulture, config)
+
+
+def _scavenge_cached(vulture, config):
+    """Replay the previous run if no file changed since then."""
+    modules, exclude_path = vulture._get_modules(
+        config["paths"], config["exclude"]
+    )
+    modules = list(modules)
+    manifest = RunManifest(config["cache_dir"], config, modules)
+    if manifest.load():
+        manifest.replay()
+        return manifest.exit_code
+    with manifest.record():
+        vulture._scavenge_modules(
+            modules, exclude_path, config["jobs"], config["cache_dir"]
+        )
+        exit_code = _report(vulture, config)
+    manifest.store(exit_code)
+    return exit_code
+
+
+def _scavenge_changed(vulture, config):
+    """Only scan the changed files again and report all unused code."""
+    try:
+        if config["changed_files"]:
+            changed_files = utils.read_changed_files(config["changed_files"])
+        else:
+            changed_files = utils.get_changed_files_since(
+                config["changed_since"]
+            )
+    except utils.VultureInputException as e:
+        print(e, file=sys.stderr)
+        return ExitCode.InvalidInput
+    scavenge_changed(
+        vulture,
+        config["paths"],
+        changed_files,
+        config["cache_dir"],
+        exclude=config["exclude"],
+        jobs=config["jobs"],
+    )
+    return _report(vulture, config)
 
 
 def main():
+    # "vulture merge PARTIAL_FILE ..." reports the unused code of partial
+    # result files written with --emit-partial.
+    merge = sys.argv[1:2] == ["merge"]
     try:
-        config = make_config()
+        config = make_config(sys.argv[2:] if merge else None)
     except InputError as e:
         print(e, file=sys.stderr)
         sys.exit(ExitCode.InvalidCmdlineArguments)
 
-    vulture = Vulture(
-        verbose=config["verbose"],
-        ignore_names=config["ignore_names"],
-        ignore_decorators=config["ignore_decorators"],
-    )
-    vulture.scavenge(config["paths"], exclude=config["exclude"])
-    sys.exit(
-        vulture.report(
+    try:
+        vulture = Vulture(
+            verbose=config["verbose"],
+            ignore_names=config["ignore_names"],
+            ignore_decorators=config["ignore_decorators"],
+            type_comments=not config["skip_type_comments"],
+            only_types=config["only_types"],
             min_confidence=config["min_confidence"],
-            sort_by_size=config["sort_by_size"],
-            make_whitelist=config["make_whitelist"],
+            stream=config["stream"],
+            fail_fast=config["fail_fast"],
         )
-    )
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        sys.exit(ExitCode.InvalidCmdlineArguments)
+    if config["cache_dir"]:
+        prune_cache(config["cache_dir"])
+    # The server, watch and partial modules build on this one.
+    if config["serve"]:
+        from vulture.server import run_server as run
+    elif config["watch"]:
+        from vulture.watch import run_watcher as run
+    elif merge:
+        from vulture.partial import run_merge as run
+    elif config["emit_partial"]:
+        from vulture.partial import run_emit as run
+    elif config["changed_files"] or config["changed_since"]:
+        run = _scavenge_changed
+    elif config["cache_dir"]:
+        run = _scavenge_cached
+    else:
+        run = _scavenge
+    sys.exit(run(vulture, config))
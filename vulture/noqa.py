@@ -1,5 +1,4 @@
 import re
-from collections import defaultdict
 
 NOQA_REGEXP = re.compile(
     # Use the same regex as flake8 does.
@@ -13,6 +12,31 @@ NOQA_REGEXP = re.compile(
     re.IGNORECASE,
 )
 
+# Variant of NOQA_REGEXP for searching the whole source code at once. It
+# replaces \s by the same characters except for those that separate lines
+# for str.splitlines(), so that matches never span multiple lines.
+_INLINE_WHITESPACE = "\t\x1f \xa0\u1680\u2000-\u200a\u202f\u205f\u3000"
+_NOQA_SOURCE_REGEXP = re.compile(
+    NOQA_REGEXP.pattern.replace(r"[,\s]", f"[,{_INLINE_WHITESPACE}]").replace(
+        r"\s", f"[{_INLINE_WHITESPACE}]"
+    ),
+    re.IGNORECASE,
+)
+# Line boundaries as recognized by str.splitlines().
+_LINE_BOUNDARY_REGEXP = re.compile(
+    "\r\n|[\n\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029]"
+)
+_RARE_LINE_BOUNDARY_REGEXP = re.compile(
+    "[\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029]"
+)
+
+# Cheap check for sources that may contain noqa comments. It works for str
+# and bytes-like sources in all ASCII-compatible encodings.
+_NOQA_STR_REGEXP = re.compile("# noqa", re.IGNORECASE)
+_NOQA_BYTES_REGEXP = re.compile(b"# noqa", re.IGNORECASE)
+
+_NO_LINES = frozenset()
+
 NOQA_CODE_MAP = {
     # flake8 F401: module imported but unused.
     "F401": "V104",
@@ -28,17 +52,52 @@ def _parse_error_codes(match):
     ]
 
 
-def parse_noqa(code):
-    noqa_lines = defaultdict(set)
-    for lineno, line in enumerate(code, start=1):
-        match = NOQA_REGEXP.search(line)
-        if match:
-            for error_code in _parse_error_codes(match):
-                error_code = NOQA_CODE_MAP.get(error_code, error_code)
-                noqa_lines[error_code].add(lineno)
+def may_contain_noqa(source):
+    if isinstance(source, str):
+        return _NOQA_STR_REGEXP.search(source) is not None
+    return _NOQA_BYTES_REGEXP.search(source) is not None
+
+
+def parse_noqa(source):
+    """
+    Map error codes to the numbers of the lines that ignore them.
+
+    Search the whole source code string at once and compute the line numbers
+    from the match offsets. Like for a line-by-line search, only the first
+    noqa comment of each line counts.
+    """
+    noqa_lines = {}
+    if not may_contain_noqa(source):
+        return noqa_lines
+
+    if _RARE_LINE_BOUNDARY_REGEXP.search(source):
+
+        def count_line_boundaries(start, end):
+            return len(_LINE_BOUNDARY_REGEXP.findall(source, start, end))
+
+    else:
+
+        def count_line_boundaries(start, end):
+            return source.count("\n", start, end)
+
+    lineno = 1
+    pos = 0
+    last_lineno = 0
+    for match in _NOQA_SOURCE_REGEXP.finditer(source):
+        lineno += count_line_boundaries(pos, match.start())
+        pos = match.start()
+        if lineno == last_lineno:
+            continue
+        last_lineno = lineno
+        for error_code in _parse_error_codes(match):
+            error_code = NOQA_CODE_MAP.get(error_code, error_code)
+            noqa_lines.setdefault(error_code, set()).add(lineno)
     return noqa_lines
 
 
 def ignore_line(noqa_lines, lineno, error_code):
     """Check if the reported line is annotated with "# noqa"."""
-    return lineno in noqa_lines[error_code] or lineno in noqa_lines["all"]
+    return bool(noqa_lines) and (
+        lineno in noqa_lines.get(error_code, _NO_LINES)
+        or lineno in noqa_lines.get("all", _NO_LINES)
+    )
@@ -0,0 +1,233 @@
+"""
+Partial results for scanning the files of a code base in shards.
+
+Each shard writes the results of its files to a partial result file. The
+``vulture merge`` command reads the partial result files one file result
+at a time and reports the unused code of the whole code base.
+"""
+
+import gzip
+import json
+import sys
+import zlib
+from functools import partial
+from pathlib import Path
+
+from vulture import core, utils
+from vulture.cache import ScanCache
+from vulture.config import parse_shard
+from vulture.utils import ExitCode, VultureInputException
+from vulture.version import __version__
+
+# Increase when the format of the stored results changes.
+FORMAT_VERSION = 2
+
+
+def get_shard(path, shards):
+    """
+    Return the zero-based shard of the given file. The hash must not depend
+    on the Python process, operating system or location of the checkout,
+    so that all shards agree. Pass paths relative to the working directory.
+    """
+    return zlib.crc32(path.as_posix().encode("utf-8")) % shards
+
+
+def _get_header(options):
+    # Headers are compared after reading them back, so only use JSON types.
+    return json.loads(
+        json.dumps(
+            {
+                "format_version": FORMAT_VERSION,
+                "version": __version__,
+                "options": options,
+            }
+        )
+    )
+
+
+def _is_compatible(header, options):
+    """
+    Return True if the partial results with the given header can be merged
+    with the given options. Shards drop the definitions below their minimum
+    confidence, so the merge may only use a higher minimum confidence.
+    """
+    try:
+        emitted_options = dict(header["options"])
+        emitted_confidence = emitted_options.pop("min_confidence")
+        merge_options = dict(options)
+        merge_confidence = merge_options.pop("min_confidence")
+        return (
+            dict(header, options=emitted_options) == _get_header(merge_options)
+            and emitted_confidence <= merge_confidence
+        )
+    except (KeyError, TypeError, ValueError):
+        return False
+
+
+class PartialWriter:
+    """
+    Write the results of scanning individual files to a partial file.
+
+    The file stores one JSON value per line: a header, the results and a
+    final null, which marks the file as complete. Unlike pickle, JSON can't
+    run code when loading partial files from other machines.
+    """
+
+    def __init__(self, path, options):
+        # The results compress well and the fastest level is good enough.
+        self._file = gzip.open(path, "wt", encoding="utf-8", compresslevel=1)
+        self.write(_get_header(options))
+
+    def write(self, record):
+        self._file.write(json.dumps(record, separators=(",", ":")) + "\n")
+
+    def close(self):
+        # Mark the file as complete, so that files of crashed shards are
+        # rejected.
+        self.write(None)
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, *args):
+        if exc_type:
+            self._file.close()
+        else:
+            self.close()
+
+
+def read_partial(path, options, load_result):
+    """
+    Yield the file results stored in the given partial file one by one.
+    ``load_result`` turns the stored records back into file results and
+    raises TypeError or ValueError for invalid records.
+
+    Raise VultureInputException if the file is no complete partial result
+    file or was created by another Vulture version or with incompatible
+    options.
+    """
+    try:
+        f = gzip.open(path, "rt", encoding="utf-8")
+    except OSError as err:
+        raise VultureInputException(f"Could not read {path} ({err})") from err
+    with f:
+        try:
+            header = json.loads(f.readline())
+        except (OSError, EOFError, ValueError) as err:
+            raise VultureInputException(
+                f"{path} is not a partial result file ({err})"
+            ) from err
+        if not _is_compatible(header, options):
+            raise VultureInputException(
+                f"{path} was created by another Vulture version or with"
+                f" incompatible options"
+            )
+        while True:
+            try:
+                line = f.readline()
+            except (OSError, EOFError, ValueError) as err:
+                raise VultureInputException(
+                    f"{path} is incomplete ({err})"
+                ) from err
+            # Each record ends with a newline.
+            if not line.endswith("\n"):
+                raise VultureInputException(f"{path} is incomplete")
+            try:
+                record = json.loads(line)
+                if record is None:
+                    return
+                result = load_result(record)
+            except (TypeError, ValueError) as err:
+                raise VultureInputException(
+                    f"{path} contains invalid results ({err})"
+                ) from err
+            yield result
+
+
+def emit_partial(
+    vulture, paths, output, exclude=None, jobs=1, cache_dir=None, shard=None
+):
+    """
+    Scan the modules of the given shard with the Vulture instance and write
+    the results to the partial result file ``output`` instead of keeping
+    them in memory.
+
+    ``shard`` is a tuple ``(index, count)`` with 1 <= index <= count.
+    Each module belongs to exactly one of the ``count`` shards. If
+    ``shard`` is None, all modules are scanned. The bundled whitelists
+    are only scanned when merging the partial results.
+
+    Paths below the working directory are hashed and stored relative to
+    it, so that shards may run in checkouts at different locations.
+    """
+    modules, exclude_path = vulture._get_modules(paths, exclude)
+    directory = Path.cwd()
+    if shard:
+        index, count = shard
+        modules = [
+            module
+            for module in modules
+            if get_shard(utils.format_path(module), count) == index - 1
+        ]
+    else:
+        modules = list(modules)
+    cache = cache_dir and ScanCache(
+        cache_dir, vulture._get_cache_options(), core._FileResult.from_record
+    )
+    with PartialWriter(output, vulture._get_analysis_options()) as writer:
+
+        def write_result(result):
+            sys.stdout.write(result.stdout)
+            sys.stderr.write(result.stderr)
+            if result.exit_code == ExitCode.InvalidInput:
+                vulture.exit_code = ExitCode.InvalidInput
+            # Verbose output doesn't belong into the partial result.
+            result.stdout = ""
+            writer.write(result.get_record(directory))
+
+        vulture._scan_modules(
+            modules, exclude_path, jobs, cache, handle_result=write_result
+        )
+
+
+def merge_partials(vulture, partial_files, exclude=None):
+    """
+    Merge the results stored in the given partial result files into the
+    Vulture instance, one file result at a time, and scan the bundled
+    whitelists afterwards.
+    """
+    _, exclude_path = vulture._get_modules([], exclude)
+    options = vulture._get_analysis_options()
+    load_result = partial(core._FileResult.from_record, directory=Path.cwd())
+    for partial_file in partial_files:
+        vulture._log("Merging:", partial_file)
+        for result in read_partial(partial_file, options, load_result):
+            vulture._merge(result)
+            if vulture.stopped_early:
+                return
+    vulture._scan_whitelists(exclude_path)
+
+
+def run_emit(vulture, config):
+    """Write the partial results of the configured shard."""
+    emit_partial(
+        vulture,
+        config["paths"],
+        config["emit_partial"],
+        exclude=config["exclude"],
+        jobs=config["jobs"],
+        cache_dir=config["cache_dir"],
+        shard=parse_shard(config["shard"]),
+    )
+    return vulture.exit_code
+
+
+def run_merge(vulture, config):
+    """Report the unused code of the configured partial result files."""
+    try:
+        merge_partials(vulture, config["paths"], exclude=config["exclude"])
+    except VultureInputException as e:
+        print(e, file=sys.stderr)
+        return ExitCode.InvalidInput
+    return core._report(vulture, config)
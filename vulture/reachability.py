@@ -1,48 +1,95 @@
 import ast
+import sys
 
 from vulture import utils
 
+# Fields of compound statements that may contain a break statement which
+# exits the enclosing loop. Loop bodies and function and class definitions
+# are not included, since break statements inside them never leave the
+# enclosing loop.
+_BREAK_FIELDS = {
+    ast.If: ("body", "orelse"),
+    ast.For: ("orelse",),
+    ast.AsyncFor: ("orelse",),
+    ast.While: ("orelse",),
+    ast.With: ("body",),
+    ast.AsyncWith: ("body",),
+    ast.Try: ("body", "handlers", "orelse", "finalbody"),
+    ast.ExceptHandler: ("body",),
+}
+if sys.version_info >= (3, 10):
+    _BREAK_FIELDS[ast.Match] = ("cases",)
+    _BREAK_FIELDS[ast.match_case] = ("body",)
+if sys.version_info >= (3, 11):
+    _BREAK_FIELDS[ast.TryStar] = _BREAK_FIELDS[ast.Try]
+
 
 class Reachability:
     def __init__(self, report):
         self._report = report
+        # The sets hold the IDs of nodes instead of the nodes themselves, so
+        # that they don't keep syntax trees alive.
         self._no_fall_through_nodes = set()
-
-    def visit(self, node):
-        """When called, all children of this node have already been visited."""
-        if isinstance(node, (ast.Break, ast.Continue, ast.Return, ast.Raise)):
-            self._mark_as_no_fall_through(node)
-
-        elif isinstance(
-            node,
-            (
-                ast.Module,
-                ast.FunctionDef,
-                ast.AsyncFunctionDef,
-                ast.With,
-                ast.AsyncWith,
-            ),
-        ):
-            self._can_fall_through_statements_analysis(node.body)
-        elif isinstance(node, ast.While):
-            self._handle_reachability_while(node)
-        elif isinstance(node, (ast.For, ast.AsyncFor)):
-            self._can_fall_through_statements_analysis(node.body)
-        elif isinstance(node, ast.If):
-            self._handle_reachability_if(node)
-        elif isinstance(node, ast.IfExp):
-            self._handle_reachability_if_expr(node)
-        elif isinstance(node, ast.Try):
-            self._handle_reachability_try(node)
+        self._nodes_with_break = set()
+
+        #: Handlers for the node types that affect reachability. Each handler
+        #: is called after all children of the node have been visited.
+        self.handlers = {
+            ast.Break: self._handle_break,
+            ast.Continue: self._mark_as_no_fall_through,
+            ast.Return: self._mark_as_no_fall_through,
+            ast.Raise: self._mark_as_no_fall_through,
+            ast.Module: self._handle_body,
+            ast.FunctionDef: self._handle_body,
+            ast.AsyncFunctionDef: self._handle_body,
+            ast.With: self._handle_block,
+            ast.AsyncWith: self._handle_block,
+            ast.For: self._handle_block,
+            ast.AsyncFor: self._handle_block,
+            ast.While: self._handle_reachability_while,
+            ast.If: self._handle_reachability_if,
+            ast.IfExp: self._handle_reachability_if_expr,
+            ast.Try: self._handle_reachability_try,
+        }
+        for node_type in _BREAK_FIELDS:
+            self.handlers.setdefault(node_type, self._record_break)
 
     def reset(self):
         self._no_fall_through_nodes = set()
+        self._nodes_with_break = set()
+
+    def _contains_break(self, node, fields):
+        """
+        Return True if the already visited children of node in the given
+        fields contain a break that exits the enclosing loop.
+        """
+        nodes_with_break = self._nodes_with_break
+        return any(
+            id(child) in nodes_with_break
+            for field in fields
+            for child in getattr(node, field)
+        )
+
+    def _record_break(self, node):
+        if self._contains_break(node, _BREAK_FIELDS[node.__class__]):
+            self._nodes_with_break.add(id(node))
 
     def _can_fall_through(self, node):
-        return node not in self._no_fall_through_nodes
+        return id(node) not in self._no_fall_through_nodes
 
     def _mark_as_no_fall_through(self, node):
-        self._no_fall_through_nodes.add(node)
+        self._no_fall_through_nodes.add(id(node))
+
+    def _handle_break(self, node):
+        self._nodes_with_break.add(id(node))
+        self._mark_as_no_fall_through(node)
+
+    def _handle_body(self, node):
+        self._can_fall_through_statements_analysis(node.body)
+
+    def _handle_block(self, node):
+        self._record_break(node)
+        self._can_fall_through_statements_analysis(node.body)
 
     def _can_fall_through_statements_analysis(self, statements):
         """Report unreachable statements.
@@ -62,9 +109,11 @@ class Reachability:
         return True
 
     def _handle_reachability_if(self, node):
+        self._record_break(node)
         has_else = bool(node.orelse)
+        condition_value = utils.evaluate_condition(node.test)
 
-        if utils.condition_is_always_false(node.test):
+        if condition_value is False:
             self._report(
                 name="if",
                 first_node=node,
@@ -76,7 +125,7 @@ class Reachability:
                 node.orelse, condition_always_true=False
             )
 
-        elif utils.condition_is_always_true(node.test):
+        elif condition_value:
             if_can_fall_through = self._can_fall_through_statements_analysis(
                 node.body
             )
@@ -119,14 +168,15 @@ class Reachability:
         return self._can_fall_through_statements_analysis(or_else)
 
     def _handle_reachability_if_expr(self, node):
-        if utils.condition_is_always_false(node.test):
+        condition_value = utils.evaluate_condition(node.test)
+        if condition_value is False:
             self._report(
                 name="ternary",
                 first_node=node,
                 last_node=node.body,
                 message="unsatisfiable 'ternary' condition",
             )
-        elif utils.condition_is_always_true(node.test):
+        elif condition_value:
             else_body = node.orelse
             self._report(
                 name="ternary",
@@ -135,7 +185,9 @@ class Reachability:
             )
 
     def _handle_reachability_while(self, node):
-        if utils.condition_is_always_false(node.test):
+        self._record_break(node)
+        condition_value = utils.evaluate_condition(node.test)
+        if condition_value is False:
             self._report(
                 name="while",
                 first_node=node,
@@ -143,7 +195,7 @@ class Reachability:
                 message="unsatisfiable 'while' condition",
             )
 
-        elif utils.condition_is_always_true(node.test):
+        elif condition_value:
             else_body = node.orelse
             if else_body:
                 self._report(
@@ -153,45 +205,13 @@ class Reachability:
                     message="unreachable 'else' block",
                 )
 
-            if not self._body_has_break(node.body):
+            if not self._contains_break(node, ("body",)):
                 self._mark_as_no_fall_through(node)
 
         self._can_fall_through_statements_analysis(node.body)
 
-    @staticmethod
-    def _body_has_break(stmts):
-        """Return True if stmts contain a break that exits the current loop.
-
-        Does not recurse into nested loops or new function/class scopes, since
-        break statements inside those do not affect the enclosing loop.
-        """
-        for stmt in stmts:
-            if isinstance(stmt, ast.Break):
-                return True
-            if isinstance(
-                stmt,
-                (
-                    ast.While,
-                    ast.For,
-                    ast.AsyncFor,
-                    ast.FunctionDef,
-                    ast.AsyncFunctionDef,
-                    ast.ClassDef,
-                ),
-            ):
-                continue
-            child_stmts = [
-                item
-                for _, field in ast.iter_fields(stmt)
-                if isinstance(field, list)
-                for item in field
-                if isinstance(item, ast.AST)
-            ]
-            if Reachability._body_has_break(child_stmts):
-                return True
-        return False
-
     def _handle_reachability_try(self, node):
+        self._record_break(node)
         try_can_fall_through = self._can_fall_through_statements_analysis(
             node.body
         )
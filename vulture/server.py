@@ -0,0 +1,212 @@
+"""
+This module keeps the results of scanning a project in memory and answers
+requests for updating files and reporting unused code.
+
+Clients send one JSON object per line and receive one JSON object per line,
+either over stdin and stdout or over a Unix socket. For example::
+
+    {"id": 1, "method": "update", "params": {"path": "a.py", "source": "..."}}
+    {"id": 1, "result": {"path": "a.py", "exit_code": 0, "errors": []}}
+
+Supported methods:
+
+* ``update(path, source=None)``: scan a new or changed file. The file is
+  read from disk if no source is given.
+* ``remove(path)``: retract everything the file contributed.
+* ``report(min_confidence=0, sort_by_size=False)``: return the unused code,
+  the syntax errors and the exit code of a normal Vulture run.
+
+Failed requests are answered with ``{"id": ..., "error": "message"}``.
+"""
+
+import inspect
+import json
+import os
+import socketserver
+import sys
+from contextlib import redirect_stdout, suppress
+from pathlib import Path
+
+from vulture import core
+from vulture.cache import ScanCache
+from vulture.utils import ExitCode
+
+
+def _get_key(path):
+    return os.path.abspath(path)
+
+
+def _get_item_dict(item):
+    return {
+        "filename": str(item.filename),
+        "first_lineno": item.first_lineno,
+        "last_lineno": item.last_lineno,
+        "type": item.typ,
+        "name": item.name,
+        "message": item.message,
+        "confidence": item.confidence,
+    }
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    def handle(self):  # noqa: V105
+        for line in self.rfile:
+            if line.strip():
+                response = self.server.analysis_server.handle_line(
+                    line.decode("utf-8")
+                )
+                self.wfile.write(response.encode("utf-8") + b"\n")
+
+
+class AnalysisServer:
+    """
+    Keep the project in a Vulture session, so that updating or removing a
+    file only requires scanning that single file.
+    """
+
+    def __init__(self, options, exclude=None):
+        # Log messages would mix with the responses.
+        self._vulture = core.Vulture(**dict(options, verbose=False))
+        self._exclude = exclude
+        exclude_path, _ = self._vulture._get_exclude_functions(exclude)
+        self._session = self._vulture._get_session(exclude_path)
+        # Clients may refer to the same file with different paths.
+        self._paths = {}
+        self._methods = {
+            "update": self.update,
+            "remove": self.remove,
+            "report": self.report,
+        }
+
+    def scan(self, paths, jobs=1, cache_dir=None):
+        """Scan the initial files of the project."""
+        vulture = self._vulture
+        modules, is_excluded = vulture._get_modules(paths, self._exclude)
+        cache = cache_dir and ScanCache(
+            cache_dir,
+            vulture._get_cache_options(),
+            core._FileResult.from_record,
+        )
+        vulture._scan_modules(
+            list(modules),
+            is_excluded,
+            jobs,
+            cache,
+            handle_result=self._add_result,
+        )
+
+    def _add_result(self, result):
+        self._paths.setdefault(_get_key(result.filename), result.filename)
+        self._vulture._add_result(result)
+
+    def update(self, path, source=None):
+        filename = self._paths.get(_get_key(path), Path(path))
+        vulture = self._vulture
+        result = core._scan_module_in_worker(
+            type(vulture), vulture._get_options(), filename, source
+        )
+        self._add_result(result)
+        return {
+            "path": path,
+            "exit_code": result.exit_code,
+            "errors": result.stderr.splitlines(),
+        }
+
+    def remove(self, path):
+        try:
+            filename = self._paths.pop(_get_key(path))
+        except KeyError:
+            raise ValueError(f"Unknown file: {path}") from None
+        self._vulture.remove_file(filename)
+
+    def report(self, min_confidence=0, sort_by_size=False):
+        vulture = self._vulture
+        items = list(
+            vulture.iter_unused(
+                min_confidence=min_confidence, sort_by_size=sort_by_size
+            )
+        )
+        exit_code = ExitCode.DeadCode if items else vulture.exit_code
+        errors = [
+            line
+            for filename in self._session.error_files
+            for line in self._session.results[filename].stderr.splitlines()
+        ]
+        return {
+            "exit_code": exit_code,
+            "errors": errors,
+            "unused_code": [_get_item_dict(item) for item in items],
+        }
+
+    def handle_line(self, line):
+        """Handle a single request line and return the response line."""
+        try:
+            request = json.loads(line)
+        except ValueError as err:
+            return self._respond(None, error=f"Invalid JSON: {err}")
+        if not isinstance(request, dict):
+            return self._respond(None, error="Requests must be JSON objects")
+        request_id = request.get("id")
+        method = self._methods.get(request.get("method"))
+        if method is None:
+            return self._respond(
+                request_id,
+                error=f"Unknown method: {request.get('method')}"
+                f" (choose from {', '.join(self._methods)})",
+            )
+        params = request.get("params", {})
+        try:
+            inspect.signature(method).bind(**params)
+        except TypeError as err:
+            return self._respond(request_id, error=f"Invalid params: {err}")
+        try:
+            result = method(**params)
+        except (OSError, TypeError, ValueError) as err:
+            # E.g., the file to update doesn't exist or is a directory.
+            return self._respond(request_id, error=str(err))
+        return self._respond(request_id, result=result)
+
+    @staticmethod
+    def _respond(request_id, result=None, error=None):
+        response = {"id": request_id}
+        if error is None:
+            response["result"] = result
+        else:
+            response["error"] = error
+        return json.dumps(response)
+
+    def serve(self, socket_path=None):
+        """
+        Answer requests over the given Unix socket, or over stdin and stdout
+        if no socket is given, until the input ends.
+        """
+        if socket_path:
+            with socketserver.UnixStreamServer(
+                socket_path, _RequestHandler
+            ) as server:
+                server.analysis_server = self
+                try:
+                    server.serve_forever()
+                finally:
+                    os.unlink(socket_path)
+        else:
+            output = sys.stdout
+            # Keep all other output away from the responses.
+            with redirect_stdout(sys.stderr):
+                for line in sys.stdin:
+                    if line.strip():
+                        output.write(self.handle_line(line) + "\n")
+                        output.flush()
+
+
+def run_server(vulture, config):
+    """Scan the configured paths and serve requests until interrupted."""
+    server = AnalysisServer(
+        vulture._get_analysis_options(), exclude=config["exclude"]
+    )
+    server.scan(
+        config["paths"], jobs=config["jobs"], cache_dir=config["cache_dir"]
+    )
+    with suppress(KeyboardInterrupt):
+        server.serve(config["socket"])
+    return ExitCode.NoDeadCode
@@ -0,0 +1,187 @@
+"""
+This module keeps the results of the files managed with Vulture.add_file(),
+update_file() and remove_file() and computes the unused code from them.
+
+Used names are reference counted per file: a name is used as long as one of
+the files uses it. The unused code of each file is cached and only computed
+again if the file changed or one of the names it defines became used or
+unused.
+
+The session only updates the used names of the Vulture instance. Its
+defined_* lists and unreachable_code stay empty, since definitions are kept
+per file in the session.
+"""
+
+import heapq
+
+from vulture import core
+from vulture.utils import ExitCode
+
+
+class Session:
+    """
+    Keep the results of the files of a Vulture instance, so that a file's
+    contributions can be retracted exactly.
+    """
+
+    def __init__(self, vulture, exclude_path=None):
+        self._vulture = vulture
+        # Bundled whitelists matching the exclude patterns aren't added.
+        self._exclude_path = exclude_path
+        # Results by filename in the order the files were added.
+        self.results = {}
+        self.error_files = {}
+        self._name_counts = {}
+        self._definers = {}
+        self._import_counts = {}
+        self._whitelists = {}
+        self._unused = {}
+        self._stale = set()
+
+    def add(self, result):
+        """Add the result of a new file or replace the result of a file."""
+        filename = result.filename
+        if filename in self.results:
+            self._retract(self.results[filename])
+        self.results[filename] = result
+        self._contribute(result)
+
+    def remove(self, filename):
+        self._retract(self.results.pop(filename))
+
+    def _contribute(self, result):
+        filename = result.filename
+        self._stale.add(filename)
+        for name in {row[1] for row in result.definitions}:
+            self._definers.setdefault(name, set()).add(filename)
+        newly_used = []
+        for name in result.used_names:
+            count = self._name_counts.get(name, 0)
+            if not count:
+                newly_used.append(name)
+            self._name_counts[name] = count + 1
+        self._vulture.used_names.update(newly_used)
+        self._invalidate(newly_used)
+        if result.exit_code == ExitCode.InvalidInput:
+            self.error_files[filename] = None
+        if filename not in self._whitelists.values():
+            for name in self._get_imports(result):
+                count = self._import_counts.get(name, 0)
+                self._import_counts[name] = count + 1
+                if not count:
+                    self._add_whitelist(name)
+
+    def _retract(self, result):
+        filename = result.filename
+        self._stale.add(filename)
+        for name in {row[1] for row in result.definitions}:
+            definers = self._definers[name]
+            definers.discard(filename)
+            if not definers:
+                del self._definers[name]
+        unused = []
+        for name in result.used_names:
+            count = self._name_counts[name] - 1
+            if count:
+                self._name_counts[name] = count
+            else:
+                del self._name_counts[name]
+                unused.append(name)
+        self._vulture.used_names.difference_update(unused)
+        self._invalidate(unused)
+        self.error_files.pop(filename, None)
+        if filename not in self._whitelists.values():
+            for name in self._get_imports(result):
+                count = self._import_counts[name] - 1
+                if count:
+                    self._import_counts[name] = count
+                else:
+                    del self._import_counts[name]
+                    if name in self._whitelists:
+                        self.remove(self._whitelists[name])
+                        del self._whitelists[name]
+
+    @staticmethod
+    def _get_imports(result):
+        import_index = core._DEFINITION_TYPES.index("import")
+        return {row[1] for row in result.definitions if row[0] == import_index}
+
+    def _add_whitelist(self, import_name):
+        if self._exclude_path and self._exclude_path(
+            core._get_whitelist_path(import_name)
+        ):
+            return
+        vulture = self._vulture
+        result = core._scan_whitelist(
+            type(vulture), vulture._get_options(), import_name
+        )
+        if result is not None:
+            self._whitelists[import_name] = result.filename
+            self.add(result)
+
+    def _invalidate(self, names):
+        for name in names:
+            self._stale.update(self._definers.get(name, ()))
+
+    def _get_unused_entries(self, result):
+        """Return the sorted (key, Item) pairs of a file's unused code."""
+        vulture = self._vulture
+        used_names = vulture.used_names
+        entries = {}
+        for row in result.definitions:
+            type_index, name, first_lineno, last_lineno, confidence = row
+            key = core._get_entry_key(first_lineno, type_index, name)
+            if (
+                name not in used_names
+                and type_index in vulture._report_type_indexes
+                and confidence >= vulture.min_confidence
+                and key not in entries
+            ):
+                entries[key] = core.Item(
+                    name,
+                    core._DEFINITION_TYPES[type_index],
+                    result.filename,
+                    first_lineno,
+                    last_lineno,
+                    confidence=confidence,
+                )
+        entries = list(entries.items())
+        entries.extend(
+            (
+                core._get_entry_key(
+                    item.first_lineno, core._UNREACHABLE_CODE_INDEX, item.name
+                ),
+                item,
+            )
+            for item in result.unreachable_code
+        )
+        entries.sort(key=lambda entry: entry[0])
+        return entries
+
+    def get_unused_code(self):
+        """
+        Return the unused code of all files ordered like the unused code of
+        scanned files. Only stale files are checked again.
+        """
+        for filename in self._stale:
+            if filename in self.results:
+                self._unused[filename] = self._get_unused_entries(
+                    self.results[filename]
+                )
+            else:
+                self._unused.pop(filename, None)
+        self._stale.clear()
+
+        # Filenames are compared case-insensitively, so a group may contain
+        # multiple files.
+        groups = {}
+        for filename, entries in self._unused.items():
+            if entries:
+                groups.setdefault(str(filename).lower(), []).append(entries)
+        unused_code = []
+        for name in sorted(groups):
+            group = groups[name]
+            if len(group) > 1:
+                group = [heapq.merge(*group, key=lambda entry: entry[0])]
+            unused_code.extend([item for _, item in group[0]])
+        return unused_code
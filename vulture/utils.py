@@ -1,5 +1,12 @@
 import ast
+import fnmatch
+import importlib.util
+import io
+import mmap
+import os
 import pathlib
+import re
+import subprocess
 import sys
 import tokenize
 from enum import IntEnum
@@ -16,41 +23,142 @@ class ExitCode(IntEnum):
     DeadCode = 3
 
 
-def _safe_eval(node, default):
+def _get_number(node, signed=False):
     """
-    Safely evaluate the Boolean expression under the given AST node.
+    Return the value of a number literal (optionally with a sign) as
+    accepted by ast.literal_eval() or None if node is no such literal.
+    """
+    if (
+        signed
+        and isinstance(node, ast.UnaryOp)
+        and isinstance(node.op, (ast.UAdd, ast.USub))
+    ):
+        value = _get_number(node.operand)
+        if value is not None and isinstance(node.op, ast.USub):
+            value = -value
+        return value
+    if isinstance(node, ast.Constant) and type(node.value) in (
+        int,
+        float,
+        complex,
+    ):
+        return node.value
+    return None
 
-    Substitute `default` for all sub-expressions that cannot be
-    evaluated (because variables or functions are undefined).
 
-    We could use eval() to evaluate more sub-expressions. However, this
-    function is not safe for arbitrary Python code. Even after
-    overwriting the "__builtins__" dictionary, the original dictionary
-    can be restored
-    (https://nedbatchelder.com/blog/201206/eval_really_is_dangerous.html).
+def _get_scalar_truth(node):
+    """
+    Return the truth value of the literal under the given AST node or None
+    if it is no literal or a container.
+    """
+    if isinstance(node, ast.Constant):
+        return bool(node.value)
+    if (
+        isinstance(node, ast.Call)
+        and isinstance(node.func, ast.Name)
+        and node.func.id == "set"
+        and not node.args
+        and not node.keywords
+    ):
+        return False
+    if isinstance(node, ast.BinOp) and isinstance(node.op, (ast.Add, ast.Sub)):
+        # Complex numbers like "1+2j".
+        left = _get_number(node.left, signed=True)
+        right = _get_number(node.right)
+        if isinstance(left, (int, float)) and isinstance(right, complex):
+            if isinstance(node.op, ast.Add):
+                return bool(left + right)
+            return bool(left - right)
+        return None
+    value = _get_number(node, signed=True)
+    return None if value is None else bool(value)
 
+
+def _get_literal_truth(node):
     """
-    if isinstance(node, ast.BoolOp):
-        results = [_safe_eval(value, default) for value in node.values]
-        if isinstance(node.op, ast.And):
-            return all(results)
-        else:
-            return any(results)
-    elif isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.Not):
-        return not _safe_eval(node.operand, not default)
+    Return the truth value of the literal under the given AST node or None
+    if ast.literal_eval() would reject the node.
+
+    Containers are not evaluated, we only check that their items are
+    literals. Nested containers are checked with an explicit stack instead
+    of recursion.
+    """
+    if isinstance(node, (ast.Tuple, ast.List, ast.Set)):
+        truth = bool(node.elts)
+    elif isinstance(node, ast.Dict):
+        truth = bool(node.keys)
     else:
-        try:
-            return ast.literal_eval(node)
-        except ValueError:
-            return default
+        return _get_scalar_truth(node)
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, (ast.Tuple, ast.List, ast.Set)):
+            stack.extend(node.elts)
+        elif isinstance(node, ast.Dict):
+            # The key is None for "**mapping".
+            if any(key is None for key in node.keys):
+                return None
+            stack.extend(node.keys)
+            stack.extend(node.values)
+        elif _get_scalar_truth(node) is None:
+            return None
+    return truth
+
 
+# Stack marker signaling that the operands of the node below it have been
+# evaluated.
+_OPERANDS_EVALUATED = object()
 
-def condition_is_always_false(condition):
-    return not _safe_eval(condition, True)
 
+def evaluate_condition(condition):
+    """
+    Return True if the Boolean expression under the given AST node is
+    always true, False if it is always false and None if it depends on
+    sub-expressions that cannot be evaluated (because variables or
+    functions are undefined).
 
-def condition_is_always_true(condition):
-    return _safe_eval(condition, False)
+    Only literals, "not" and Boolean operators are evaluated, without
+    executing any code. We could use eval() to evaluate more
+    sub-expressions. However, this function is not safe for arbitrary
+    Python code. Even after overwriting the "__builtins__" dictionary, the
+    original dictionary can be restored
+    (https://nedbatchelder.com/blog/201206/eval_really_is_dangerous.html).
+
+    Operands are evaluated before their operators with an explicit stack
+    instead of recursion, so deeply nested conditions (e.g., long chains
+    of "not") don't hit the recursion limit.
+
+    """
+    stack = [condition]
+    # Truth values of the evaluated operands.
+    values = []
+    while stack:
+        node = stack.pop()
+        if node is _OPERANDS_EVALUATED:
+            node = stack.pop()
+            if isinstance(node, ast.BoolOp):
+                operands = values[-len(node.values) :]
+                del values[-len(node.values) :]
+                # "or" is true as soon as one value is true, "and" is false
+                # as soon as one value is false.
+                decisive = isinstance(node.op, ast.Or)
+                if any(truth is decisive for truth in operands):
+                    values.append(decisive)
+                elif any(truth is None for truth in operands):
+                    values.append(None)
+                else:
+                    values.append(not decisive)
+            else:
+                truth = values.pop()
+                values.append(None if truth is None else not truth)
+        elif isinstance(node, ast.BoolOp):
+            stack.extend([node, _OPERANDS_EVALUATED])
+            stack.extend(reversed(node.values))
+        elif isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.Not):
+            stack.extend([node, _OPERANDS_EVALUATED, node.operand])
+        else:
+            values.append(_get_literal_truth(node))
+    return values[0]
 
 
 def is_ast_string(node):
@@ -79,36 +187,197 @@ def get_decorator_name(decorator):
     return "@" + ".".join(reversed(parts))
 
 
-def get_modules(paths):
+def _get_entry_key(entry, device):
+    """
+    Return whether the directory entry is a directory and a key identifying
+    the directory or *.py file. The key is None for other entries and for
+    entries that can't be accessed.
+    """
+    try:
+        if entry.is_dir(follow_symlinks=False):
+            return True, (device, entry.inode())
+        if entry.name.endswith(".py") and entry.is_file():
+            if entry.is_symlink():
+                stat = entry.stat()
+                return False, (stat.st_dev, stat.st_ino)
+            return False, (device, entry.inode())
+    except OSError:
+        pass
+    return False, None
+
+
+def _walk_directory(directory, is_excluded_dir, seen):
+    """Yield all *.py files below the directory in a stable order.
+
+    Skip directories for which is_excluded_dir() returns True, symbolic links
+    to directories and files or directories that have been seen before.
+
+    """
+    stack = [directory]
+    while stack:
+        directory = stack.pop()
+        try:
+            device = directory.stat().st_dev
+            with os.scandir(directory) as it:
+                entries = sorted(it, key=lambda entry: entry.name)
+        except OSError:
+            continue
+        subdirectories = []
+        for entry in entries:
+            is_dir, key = _get_entry_key(entry, device)
+            if key is None or key in seen:
+                continue
+            path = pathlib.Path(entry.path)
+            if not is_dir:
+                seen.add(key)
+                yield path
+            elif not is_excluded_dir(path):
+                seen.add(key)
+                subdirectories.append(path)
+        # Visit subdirectories in order after the files of this directory.
+        stack.extend(reversed(subdirectories))
+
+
+def get_modules(paths, is_excluded_dir=lambda path: False):
     """Retrieve Python files to check.
 
     Loop over all given paths, abort if any ends with .pyc, add the other given
     files (even those not ending with .py) and collect all .py files under the
     given directories.
 
+    Modules are yielded lazily while walking the directories. Directories for
+    which is_excluded_dir() returns True are not entered. Files that are
+    reachable via multiple paths (e.g., overlapping arguments or symbolic
+    links) are only yielded once.
+
     """
-    modules = []
+    paths = [path.resolve() for path in paths]
+    # Check all paths before yielding the first module.
     for path in paths:
-        path = path.resolve()
         if path.is_file():
             if path.suffix == ".pyc":
                 sys.exit(f"Error: *.pyc files are not supported: {path}")
-            else:
-                modules.append(path)
-        elif path.is_dir():
-            modules.extend(path.rglob("*.py"))
-        else:
+        elif not path.is_dir():
             sys.exit(f"Error: {path} could not be found.")
-    return modules
+
+    seen = set()
+    for path in paths:
+        stat = path.stat()
+        key = (stat.st_dev, stat.st_ino)
+        if key in seen:
+            continue
+        seen.add(key)
+        if path.is_file():
+            yield path
+        else:
+            yield from _walk_directory(path, is_excluded_dir, seen)
+
+
+# Files of at least this size are memory-mapped instead of read.
+MMAP_THRESHOLD = 16 * 2**20
+
+
+def read_changed_files(filename):
+    """Return the paths listed in the given file, one path per line."""
+    try:
+        with open(filename, encoding="utf-8") as f:
+            return [line.rstrip("\r\n") for line in f if line.strip()]
+    except (OSError, UnicodeDecodeError) as err:
+        raise VultureInputException(
+            f"Could not read changed files from {filename} ({err})"
+        ) from err
+
+
+def get_changed_files_since(revision):
+    """
+    Return the paths of the files that differ from the given Git revision
+    and of untracked files, relative to the working directory.
+    """
+    commands = [
+        ["git", "diff", "--name-only", "--relative", "-z", revision, "--"],
+        ["git", "ls-files", "--others", "--exclude-standard", "-z"],
+    ]
+    paths = []
+    for command in commands:
+        try:
+            process = subprocess.run(
+                command,
+                capture_output=True,
+                check=True,
+                text=True,
+                errors="surrogateescape",
+            )
+        except (OSError, subprocess.CalledProcessError) as err:
+            stderr = getattr(err, "stderr", "") or ""
+            raise VultureInputException(
+                f"Could not list files changed since {revision}:"
+                f" {stderr.strip() or err}"
+            ) from err
+        paths.extend(path for path in process.stdout.split("\0") if path)
+    return paths
 
 
-def read_file(filename):
+def read_source(filename):
+    """Return the undecoded contents of a Python file.
+
+    ast.parse() detects the encoding itself, so we only check that the
+    encoding declaration is valid. Large files are memory-mapped.
+
+    """
+    with open(filename, "rb") as f:
+        if os.fstat(f.fileno()).st_size >= MMAP_THRESHOLD:
+            source = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            readline = source.readline
+        else:
+            source = f.read()
+            readline = io.BytesIO(source).readline
     try:
-        # Use encoding detected by tokenize.detect_encoding().
-        with tokenize.open(filename) as f:
-            return f.read()
-    except (SyntaxError, UnicodeDecodeError) as err:
+        tokenize.detect_encoding(readline)
+    except SyntaxError as err:
         raise VultureInputException from err
+    return source
+
+
+def decode_source(source):
+    """Return the source code as a string."""
+    if isinstance(source, str):
+        return source
+    # Use the encoding detected by tokenize.detect_encoding().
+    return importlib.util.decode_source(bytes(source))
+
+
+class PatternMatcher:
+    """
+    Match strings or paths against a list of glob patterns.
+
+    All patterns are compiled into a single regular expression and results
+    are memoized per string. With case=False, patterns and strings are
+    normalized with os.path.normcase() like fnmatch.fnmatch() does.
+    """
+
+    def __init__(self, patterns, case=True):
+        self._case = case
+        patterns = [self._normalize(pattern) for pattern in patterns]
+        self._regex = (
+            re.compile("|".join(fnmatch.translate(p) for p in patterns))
+            if patterns
+            else None
+        )
+        self._results = {}
+
+    def _normalize(self, name):
+        name = os.fspath(name)
+        return name if self._case else os.path.normcase(name)
+
+    def match(self, name):
+        if self._regex is None:
+            return False
+        try:
+            return self._results[name]
+        except KeyError:
+            result = bool(self._regex.match(self._normalize(name)))
+            self._results[name] = result
+            return result
 
 
 class LoggingList(list):
@@ -0,0 +1,218 @@
+"""
+This module polls the watched paths for changes and keeps the unused code
+of a Vulture session up to date.
+
+Only stat() metadata is compared: a file is scanned again if its
+modification time, size or inode changed. Directories are only listed
+again if their modification time changed, which happens when files or
+subdirectories are added, removed or renamed.
+"""
+
+import os
+import sys
+import time
+from pathlib import Path
+
+from vulture import core
+from vulture.cache import ScanCache
+from vulture.utils import ExitCode
+
+
+def _get_signature(stat):
+    return (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+
+
+class Watcher:
+    """Scan new and changed files of the watched paths again."""
+
+    def __init__(self, vulture, paths, exclude=None):
+        self._vulture = vulture
+        self._is_excluded, self._is_excluded_dir = (
+            vulture._get_exclude_functions(exclude)
+        )
+        self._session = vulture._get_session(self._is_excluded)
+        self._roots = [Path(path).resolve() for path in paths]
+        for root in self._roots:
+            if not root.exists():
+                sys.exit(f"Error: {root} could not be found.")
+        # Signatures of the watched files and modification times of the
+        # watched directories.
+        self._files = {}
+        self._directories = {}
+        self._unused_code = None
+
+    def scan(self, jobs=1, cache_dir=None):
+        """Discover and scan the initial files."""
+        modules = []
+        for root in self._roots:
+            if root.is_dir():
+                modules.extend(self._walk(root))
+            elif root not in self._files and not self._is_excluded(root):
+                modules.append(root)
+                self._files[root] = None
+        for module in modules:
+            # Files that change while they are scanned are scanned again.
+            self._files[module] = self._stat(module)
+        cache = cache_dir and ScanCache(
+            cache_dir,
+            self._vulture._get_cache_options(),
+            core._FileResult.from_record,
+        )
+        self._vulture._scan_modules(
+            modules,
+            self._is_excluded,
+            jobs,
+            cache,
+            handle_result=self._add_result,
+        )
+
+    def _add_result(self, result):
+        sys.stdout.write(result.stdout)
+        sys.stderr.write(result.stderr)
+        self._vulture._add_result(result)
+
+    @staticmethod
+    def _stat(module):
+        try:
+            return _get_signature(module.stat())
+        except OSError:
+            return None
+
+    def _list_directory(self, directory):
+        """
+        Remember the modification time of the directory and return its
+        subdirectories and Python files. Excluded directories, excluded
+        files and symbolic links to directories are skipped.
+        """
+        subdirectories = []
+        modules = []
+        try:
+            self._directories[directory] = directory.stat().st_mtime_ns
+            with os.scandir(directory) as it:
+                entries = sorted(it, key=lambda entry: entry.name)
+        except OSError:
+            self._directories.pop(directory, None)
+            return subdirectories, modules
+        for entry in entries:
+            path = Path(entry.path)
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    if not self._is_excluded_dir(path):
+                        subdirectories.append(path)
+                elif (
+                    entry.name.endswith(".py")
+                    and entry.is_file()
+                    and not self._is_excluded(path)
+                ):
+                    modules.append(path)
+            except OSError:
+                continue
+        return subdirectories, modules
+
+    def _walk(self, directory):
+        """Return the new Python files below the directory."""
+        new_modules = []
+        stack = [directory]
+        while stack:
+            directory = stack.pop()
+            subdirectories, modules = self._list_directory(directory)
+            for module in modules:
+                if module not in self._files:
+                    self._files[module] = None
+                    new_modules.append(module)
+            stack.extend(
+                subdirectory
+                for subdirectory in reversed(subdirectories)
+                if subdirectory not in self._directories
+            )
+        return new_modules
+
+    def _scan_file(self, module):
+        """
+        Scan a new or changed file. Return False if the file was removed
+        in the meantime.
+        """
+        try:
+            if module in self._session.results:
+                self._vulture.update_file(module)
+            else:
+                self._vulture.add_file(module)
+        except OSError:
+            return False
+        return True
+
+    def poll(self):
+        """
+        Apply all changes since the last poll to the session. Return True if
+        a file was added, changed or removed.
+        """
+        for directory, mtime in list(self._directories.items()):
+            try:
+                changed = directory.stat().st_mtime_ns != mtime
+            except OSError:
+                # The files below removed directories are removed below.
+                del self._directories[directory]
+                continue
+            if changed:
+                self._walk(directory)
+
+        vulture = self._vulture
+        changed = False
+        for module, signature in list(self._files.items()):
+            new_signature = self._stat(module)
+            if new_signature == signature:
+                continue
+            changed = True
+            if new_signature is not None and self._scan_file(module):
+                self._files[module] = new_signature
+                continue
+            del self._files[module]
+            if module in self._session.results:
+                vulture.remove_file(module)
+        return changed
+
+    def report_changes(self, min_confidence=0):
+        """
+        Print the unused code that appeared (+) or disappeared (-) since the
+        last call, or all unused code on the first call. Return the exit code
+        of a normal run.
+        """
+        unused_code = list(
+            self._vulture.iter_unused(min_confidence=min_confidence)
+        )
+        if self._unused_code is None:
+            for item in unused_code:
+                print(item.get_report())
+        else:
+            previous = set(self._unused_code)
+            current = set(unused_code)
+            for item in self._unused_code:
+                if item not in current:
+                    print(f"- {item.get_report()}")
+            for item in unused_code:
+                if item not in previous:
+                    print(f"+ {item.get_report()}")
+        sys.stdout.flush()
+        self._unused_code = unused_code
+        return ExitCode.DeadCode if unused_code else self._vulture.exit_code
+
+    def watch(self, min_confidence=0, interval=1.0):
+        """
+        Report changes of the unused code until interrupted and return the
+        exit code for the last report.
+        """
+        exit_code = self.report_changes(min_confidence)
+        try:
+            while True:
+                time.sleep(interval)
+                if self.poll():
+                    exit_code = self.report_changes(min_confidence)
+        except KeyboardInterrupt:
+            return exit_code
+
+
+def run_watcher(vulture, config):
+    """Report changes of the unused code in the configured paths."""
+    watcher = Watcher(vulture, config["paths"], exclude=config["exclude"])
+    watcher.scan(jobs=config["jobs"], cache_dir=config["cache_dir"])
+    return watcher.watch(min_confidence=config["min_confidence"])